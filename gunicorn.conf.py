@@ -1,5 +1,6 @@
 # Gunicorn configuration file for CEAF Farmacia application
 
+import gc
 import multiprocessing
 import os
 
@@ -42,6 +43,13 @@ def on_starting(server):
     """Called just before the master process is initialized."""
     server.log.info("Starting Farmacia application...")
 
+def when_ready(server):
+    """Called just after the server is started, before any worker is forked."""
+    # With preload_app the scraped data was parsed once here in the master.
+    # Freezing it keeps the garbage collector from writing to those objects,
+    # so forked workers keep sharing their pages copy-on-write
+    gc.freeze()
+
 def on_reload(server):
     """Called to recycle workers during a reload via SIGHUP."""
     server.log.info("Reloading Farmacia application...")
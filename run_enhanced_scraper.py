@@ -13,6 +13,7 @@ from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from scraper import CEAFScraper
+from paths import CACHE_DIR
 
 def main():
     parser = argparse.ArgumentParser(description='Enhanced CEAF Scraper with PDF Processing')
@@ -24,6 +25,14 @@ def main():
                        help='Skip LLM processing (no structured data extraction)')
     parser.add_argument('--output', type=str, default=None,
                        help='Output filename (default: auto-generated)')
+    parser.add_argument('--cache-dir', type=str, default=str(CACHE_DIR),
+                       help='Directory for cached PDF text and LLM results (default: the project cache/ directory)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Disable the PDF text and LLM result caches')
+    parser.add_argument('--max-pdf-pages', type=int, default=None,
+                       help='Only extract the first N pages of each PDF (default: all)')
+    parser.add_argument('--http-cache', action='store_true',
+                       help='Cache page and PDF responses on disk for a day (requires requests-cache)')
     
     args = parser.parse_args()
     
@@ -37,13 +46,20 @@ def main():
     print(f"📊 Configuration:")
     print(f"   PDF Processing: {'✅ Enabled' if include_pdf_data else '❌ Disabled'}")
     print(f"   LLM Processing: {'✅ Enabled' if use_llm else '❌ Disabled'}")
+    print(f"   Cache: {'❌ Disabled' if args.no_cache else args.cache_dir}")
+    if args.max_pdf_pages:
+        print(f"   PDF Page Limit: first {args.max_pdf_pages} pages")
     if args.limit:
         print(f"   Condition Limit: {args.limit} (testing mode)")
     print()
     
+    scraper = None
     try:
         # Initialize scraper
-        scraper = CEAFScraper(use_llm=use_llm)
+        scraper = CEAFScraper(use_llm=use_llm,
+                              cache_dir=None if args.no_cache else args.cache_dir,
+                              max_pdf_pages=args.max_pdf_pages,
+                              http_cache_expire=24 * 3600 if args.http_cache else None)
         
         if include_pdf_data:
             print("⚠️  PDF processing enabled - this will take significantly longer!")
@@ -68,7 +84,8 @@ def main():
             all_conditions = scraper.extract_clinical_conditions()
             limited_conditions = all_conditions[:args.limit]
             
-            # Process each condition
+            # Process each condition, queueing PDF texts for one batched LLM pass
+            pending_llm = []
             for i, condition in enumerate(limited_conditions):
                 print(f"\n🔍 Processing condition {i+1}/{len(limited_conditions)}: {condition['name']}")
                 
@@ -84,10 +101,7 @@ def main():
                             
                             # Extract structured data using LLM if available
                             if scraper.llm_processor and pdf_text.strip():
-                                structured_data = scraper.llm_processor.extract_pdf_structured_data(
-                                    pdf_text, condition['name']
-                                )
-                                condition.update(structured_data)
+                                pending_llm.append(condition)
                         else:
                             condition['pdf_extracted'] = False
                     else:
@@ -97,6 +111,14 @@ def main():
                 import time
                 time.sleep(1)
             
+            if pending_llm:
+                print(f"\n🧠 Extracting structured data from {len(pending_llm)} PDFs...")
+                results = scraper.llm_processor.extract_batch(
+                    [(condition['pdf_text'], condition['name']) for condition in pending_llm]
+                )
+                for condition, structured_data in zip(pending_llm, results):
+                    condition.update(structured_data)
+            
             # Create result data
             data = {
                 'scraped_at': datetime.now().isoformat(),
@@ -202,6 +224,10 @@ def main():
         print(f"\n❌ Scraping failed with error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        # Shut down the PDF worker processes and the HTTP session
+        if scraper is not None:
+            scraper.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
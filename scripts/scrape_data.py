@@ -52,6 +52,7 @@ def main():
     
     args = parser.parse_args()
     
+    scraper = None
     try:
         logger.info("Starting CEAF data scraping...")
         
@@ -138,6 +139,9 @@ def main():
         logger.error(f"Scraping failed: {e}", exc_info=True)
         print(f"\nError: {e}")
         sys.exit(1)
+    finally:
+        if scraper is not None:
+            scraper.close()
 
 
 if __name__ == "__main__":
@@ -6,14 +6,22 @@ from flask import Flask, render_template, request, jsonify, send_from_directory
 from flask_cors import CORS
 import json
 import os
+import mmap
 import logging
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 import re
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from scraper import CEAFScraper
 from llm_processor import LLMProcessor
 from cache import cache_manager
+from paths import DATA_DIR
 
 
 app = Flask(__name__, 
@@ -25,12 +33,29 @@ CORS(app)
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Scraped data files DataManager can serve; the timestamp suffix makes the
+# lexically greatest name the newest
+SCRAPED_FILE_RE = re.compile(
+    r'(?:ceaf_conditions_|enhanced_ceaf_conditions_|enhanced_parsed_ceaf_conditions_'
+    r'|enhanced_with_descriptions_|multiple_pdfs_demo_).*\.json\Z'
+)
+
 # Global data storage
 SCRAPED_DATA = {}
 PROCESSED_DATA = {}
 SEARCH_INDEX = {}
 
 
+def unique_by_protocol(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Drop repeated conditions, keeping the first entry per name + PDF pair."""
+    # name + pdf_name as key so multiple protocols for the same condition survive;
+    # dicts keep insertion order, so results stay in their original order
+    unique = {}
+    for item in items:
+        unique.setdefault(item['name'] + '|' + item.get('pdf_name', ''), item)
+    return list(unique.values())
+
+
 def perform_ai_search(query: str, conditions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Use AI to find matching conditions based on synonyms, abbreviations, and related terms."""
     try:
@@ -302,14 +327,7 @@ def fallback_smart_search(query: str, conditions: List[Dict[str, Any]]) -> List[
                         break
     
     # Remove duplicates (consider both name and PDF to handle multiple protocols for same condition)
-    unique_matches = []
-    seen_keys = set()
-    for match in matches:
-        # Use name + pdf_name as unique key to allow multiple protocols for same condition
-        key = match['name'] + '|' + match.get('pdf_name', '')
-        if key not in seen_keys:
-            unique_matches.append(match)
-            seen_keys.add(key)
+    unique_matches = unique_by_protocol(matches)
     
     # Log the search process
     logger.info(f"Enhanced search for '{query}': found {len(unique_matches)} matches")
@@ -323,37 +341,58 @@ def fallback_smart_search(query: str, conditions: List[Dict[str, Any]]) -> List[
 class DataManager:
     """Manage scraped and processed data loading/saving."""
     
+    # Path of the file behind the last successful load_latest_scraped_data()
+    last_loaded_path: Optional[str] = None
+    
+    @staticmethod
+    def read_json(filepath: str) -> Dict[str, Any]:
+        """Parse a JSON data file, with orjson when it is installed."""
+        if ORJSON_AVAILABLE:
+            # orjson parses straight from the mapped pages, so the file is never
+            # copied into a bytes object first
+            with open(filepath, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return orjson.loads(b'')
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # Ask the kernel to read the whole file ahead instead of
+                    # faulting pages in one by one as the parser walks it
+                    if hasattr(mapped, 'madvise') and hasattr(mmap, 'MADV_WILLNEED'):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                        mapped.madvise(mmap.MADV_WILLNEED)
+                    with memoryview(mapped) as view:
+                        return orjson.loads(view)
+        with open(filepath, 'r', encoding='utf-8') as f:
+            if hasattr(os, 'posix_fadvise'):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            return json.load(f)
+    
     @staticmethod
     def load_latest_scraped_data() -> Dict[str, Any]:
         """Load the most recent scraped data."""
-        data_dir = 'data'
-        if not os.path.exists(data_dir):
+        # Look for all types of condition data files (a missing directory
+        # surfaces from the listing itself rather than a separate exists() check)
+        try:
+            with os.scandir(DATA_DIR) as entries:
+                files = [entry.name for entry in entries if SCRAPED_FILE_RE.match(entry.name)]
+        except FileNotFoundError:
             return {}
-        
-        # Look for all types of condition data files
-        files = [f for f in os.listdir(data_dir) if 
-                (f.startswith('ceaf_conditions_') or 
-                 f.startswith('enhanced_ceaf_conditions_') or 
-                 f.startswith('enhanced_parsed_ceaf_conditions_') or
-                 f.startswith('enhanced_with_descriptions_') or
-                 f.startswith('multiple_pdfs_demo_')) 
-                and f.endswith('.json')]
         if not files:
             return {}
         
         # Prioritize enhanced_ceaf_conditions files over others
         enhanced_files = [f for f in files if f.startswith('enhanced_ceaf_conditions_')]
         if enhanced_files:
-            latest_file = sorted(enhanced_files)[-1]
+            latest_file = max(enhanced_files)
         else:
-            latest_file = sorted(files)[-1]
-        filepath = os.path.join(data_dir, latest_file)
+            latest_file = max(files)
+        filepath = os.path.join(DATA_DIR, latest_file)
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded scraped data from {filepath}")
-                return data
+            data = DataManager.read_json(filepath)
+            DataManager.last_loaded_path = filepath
+            logger.info(f"Loaded scraped data from {filepath}")
+            return data
         except Exception as e:
             logger.error(f"Failed to load scraped data: {e}")
             return {}
@@ -361,22 +400,20 @@ class DataManager:
     @staticmethod
     def load_latest_processed_data() -> Dict[str, Any]:
         """Load the most recent processed data."""
-        data_dir = 'data'
-        if not os.path.exists(data_dir):
+        try:
+            files = [f for f in os.listdir(DATA_DIR) if f.startswith('processed_conditions_') and f.endswith('.json')]
+        except FileNotFoundError:
             return {}
-        
-        files = [f for f in os.listdir(data_dir) if f.startswith('processed_conditions_') and f.endswith('.json')]
         if not files:
             return {}
         
-        latest_file = sorted(files)[-1]
-        filepath = os.path.join(data_dir, latest_file)
+        latest_file = max(files)
+        filepath = os.path.join(DATA_DIR, latest_file)
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                logger.info(f"Loaded processed data from {filepath}")
-                return data
+            data = DataManager.read_json(filepath)
+            logger.info(f"Loaded processed data from {filepath}")
+            return data
         except Exception as e:
             logger.error(f"Failed to load processed data: {e}")
             return {}
@@ -494,14 +531,7 @@ def search():
                 results.append(ai_result)
     
     # Remove duplicates (consider both name and PDF to handle multiple protocols for same condition)
-    unique_results = []
-    seen_keys = set()
-    for result in results:
-        # Use name + pdf_name as unique key to allow multiple protocols for same condition
-        key = result['name'] + '|' + result.get('pdf_name', '')
-        if key not in seen_keys:
-            unique_results.append(result)
-            seen_keys.add(key)
+    unique_results = unique_by_protocol(results)
     
     # Cache the results for future use
     cache_manager.set_search_results(query, unique_results)
@@ -642,10 +672,10 @@ def api_refresh():
     try:
         logger.info("Starting data refresh...")
         
-        # Re-scrape data
-        scraper = CEAFScraper()
-        new_scraped_data = scraper.scrape_all_conditions()
-        scraper.save_data(new_scraped_data)
+        # Re-scrape data; closing the scraper shuts down its PDF worker processes
+        with CEAFScraper() as scraper:
+            new_scraped_data = scraper.scrape_all_conditions()
+            scraper.save_data(new_scraped_data)
         
         # Re-process data
         processor = LLMProcessor()
@@ -653,7 +683,7 @@ def api_refresh():
         
         # Save processed data
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        processed_file = f"data/processed_conditions_{timestamp}.json"
+        processed_file = os.path.join(DATA_DIR, f"processed_conditions_{timestamp}.json")
         with open(processed_file, 'w', encoding='utf-8') as f:
             json.dump(new_processed_data, f, ensure_ascii=False, indent=2)
         
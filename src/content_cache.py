@@ -0,0 +1,160 @@
+"""
+On-disk caches for extracted PDF text and LLM results.
+
+Kept apart from cache.py so that importing them has no side effects: the
+scraper, the LLM processor and the spawned PDF worker processes all import
+this module, and none of them should create the shared CacheManager.
+"""
+
+import json
+import os
+import time
+import logging
+import hashlib
+import threading
+from typing import Any, Dict, Optional, Union
+from pathlib import Path
+
+from paths import CACHE_DIR, ensure_dir
+
+
+def content_key(*parts: str) -> str:
+    """SHA-256 over length-prefixed parts, so ("ab", "c") and ("a", "bc") never collide."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode('utf-8')
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    """Write JSON via a temp file and rename so readers never see a partial file."""
+    # Cache directories are only created once something is written to them
+    ensure_dir(path.parent)
+    tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+class PDFCache:
+    """Content-addressed file cache for extracted PDF text.
+
+    Text is stored under pdf_text/<sha256 of the PDF bytes>.json together with
+    the parser version that produced it, so upgrading an extractor invalidates
+    old entries. A small URL index keeps each PDF's ETag/Last-Modified so
+    unchanged files can be skipped with a conditional GET.
+    """
+    
+    def __init__(self, cache_dir: Union[str, Path] = CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.text_dir = self.cache_dir / "pdf_text"
+        self.index_path = self.cache_dir / "pdf_urls.json"
+        self.logger = logging.getLogger(__name__)
+        
+        # Scraper worker threads share one index
+        self._lock = threading.Lock()
+        self._url_index = self._load_url_index()
+    
+    def _load_url_index(self) -> Dict[str, Dict[str, str]]:
+        """Load the URL -> validators/hash index from disk."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable PDF URL index {self.index_path}: {e}")
+            return {}
+    
+    def get_text(self, content_hash: str, parser_version: str) -> Optional[str]:
+        """Return cached text for a PDF hash if it was extracted by the same parser version."""
+        file_path = self.text_dir / f"{content_hash}.json"
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                cache_entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to read cached PDF text {content_hash[:8]}...: {e}")
+            return None
+        
+        if cache_entry.get("parser_version") != parser_version:
+            return None
+        return cache_entry["text"]
+    
+    def set_text(self, content_hash: str, text: str, parser_version: str) -> bool:
+        """Cache extracted text for a PDF hash."""
+        cache_entry = {
+            "text": text,
+            "parser_version": parser_version,
+            "cached_at": time.time()
+        }
+        try:
+            _write_json_atomic(self.text_dir / f"{content_hash}.json", cache_entry)
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to cache PDF text {content_hash[:8]}...: {e}")
+            return False
+    
+    def get_url_text(self, url: str, parser_version: str) -> Optional[str]:
+        """Return cached text for the PDF last downloaded from a URL."""
+        entry = self._url_index.get(url)
+        if not entry:
+            return None
+        return self.get_text(entry["sha256"], parser_version)
+    
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match/If-Modified-Since headers from a URL's stored validators."""
+        entry = self._url_index.get(url) or {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+    
+    def set_url(self, url: str, content_hash: str, etag: Optional[str] = None,
+                last_modified: Optional[str] = None) -> bool:
+        """Record which content a URL served, with its HTTP validators."""
+        with self._lock:
+            self._url_index[url] = {
+                "sha256": content_hash,
+                "etag": etag,
+                "last_modified": last_modified
+            }
+            try:
+                _write_json_atomic(self.index_path, self._url_index)
+                return True
+            except Exception as e:
+                self.logger.error(f"Failed to update PDF URL index: {e}")
+                return False
+
+
+class LLMCache:
+    """File cache for LLM extraction results, keyed by content_key() of the prompt inputs."""
+    
+    def __init__(self, cache_dir: Union[str, Path] = CACHE_DIR):
+        self.llm_dir = Path(cache_dir) / "llm"
+        self.logger = logging.getLogger(__name__)
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a cached LLM result."""
+        try:
+            with open(self.llm_dir / f"{key}.json", 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            self.logger.warning(f"Failed to read cached LLM result {key[:8]}...: {e}")
+            return None
+    
+    def set(self, key: str, value: Dict[str, Any]) -> bool:
+        """Cache an LLM result."""
+        try:
+            _write_json_atomic(self.llm_dir / f"{key}.json", value)
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to cache LLM result {key[:8]}...: {e}")
+            return False
@@ -4,11 +4,16 @@ LLM integration for processing and simplifying CEAF clinical conditions data.
 
 import json
 import logging
-from typing import List, Dict, Optional, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Any, Tuple
 from datetime import datetime
 import os
 from dotenv import load_dotenv
 
+from content_cache import LLMCache, content_key
+from paths import DATA_DIR
+
 # Load environment variables
 load_dotenv()
 
@@ -26,14 +31,31 @@ except ImportError:
     ANTHROPIC_AVAILABLE = False
     logging.warning("Anthropic not available. Install with: pip install anthropic")
 
+# Model used for each provider
+MODELS = {
+    "openai": "gpt-3.5-turbo",
+    "anthropic": "claude-3-sonnet-20240229",
+}
+
+# Bump whenever the PDF extraction prompt changes so cached results are not reused
+PDF_EXTRACTION_PROMPT_VERSION = "1"
+
 
 class LLMProcessor:
     """Process CEAF data using Large Language Models to make it more patient-friendly."""
     
-    def __init__(self, provider: str = "anthropic"):
+    def __init__(self, provider: str = "anthropic", cache_dir: Optional[str] = None,
+                 max_concurrent_calls: int = 4):
         self.provider = provider.lower()
         self.logger = logging.getLogger(__name__)
         
+        # Caps in-flight API calls across all threads sharing this processor,
+        # keeping concurrent scraper workers within the provider's rate limit
+        self._call_slots = threading.BoundedSemaphore(max_concurrent_calls)
+        
+        # PDF extraction results are cached on disk when a cache_dir is given
+        self.llm_cache = LLMCache(cache_dir) if cache_dir else None
+        
         # Initialize the selected LLM client
         if self.provider == "openai" and OPENAI_AVAILABLE:
             openai.api_key = os.getenv("OPENAI_API_KEY")
@@ -183,6 +205,15 @@ class LLMProcessor:
         if not self.client or not pdf_text.strip():
             return self._fallback_pdf_extraction(condition_name, pdf_text)
         
+        cache_key = None
+        if self.llm_cache:
+            cache_key = content_key(PDF_EXTRACTION_PROMPT_VERSION, self.provider,
+                                    MODELS.get(self.provider, ""), condition_name, pdf_text)
+            cached_data = self.llm_cache.get(cache_key)
+            if cached_data is not None:
+                self.logger.info(f"Using cached LLM extraction for {condition_name}")
+                return cached_data
+        
         prompt = f"""
         You are analyzing a medical protocol document for the condition: {condition_name}
         
@@ -233,6 +264,9 @@ class LLMProcessor:
                 "extraction_method": "llm"
             })
             
+            if cache_key:
+                self.llm_cache.set(cache_key, structured_data)
+            
             return structured_data
             
         except json.JSONDecodeError as e:
@@ -242,6 +276,14 @@ class LLMProcessor:
             self.logger.error(f"Failed to extract PDF data for {condition_name}: {e}")
             return self._fallback_pdf_extraction(condition_name, pdf_text)
     
+    def extract_batch(self, items: List[Tuple[str, str]], max_workers: int = 8) -> List[Dict[str, Any]]:
+        """Run extract_pdf_structured_data over (pdf_text, condition_name) pairs concurrently, preserving order."""
+        if not items:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+            return list(executor.map(lambda item: self.extract_pdf_structured_data(*item), items))
+    
     def _fallback_pdf_extraction(self, condition_name: str, pdf_text: str = "") -> Dict[str, Any]:
         """Fallback PDF data extraction when LLM is not available."""
         # Try to use text parser if we have PDF text
@@ -266,9 +308,14 @@ class LLMProcessor:
     
     def _call_llm(self, prompt: str) -> str:
         """Call the configured LLM with the given prompt."""
+        with self._call_slots:
+            return self._call_provider(prompt)
+    
+    def _call_provider(self, prompt: str) -> str:
+        """Send a prompt to the configured provider's API."""
         if self.provider == "openai":
             response = self.client.chat.completions.create(
-                model="gpt-3.5-turbo",
+                model=MODELS["openai"],
                 messages=[{"role": "user", "content": prompt}],
                 max_tokens=2000,
                 temperature=0.3
@@ -277,7 +324,7 @@ class LLMProcessor:
             
         elif self.provider == "anthropic":
             message = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
+                model=MODELS["anthropic"],
                 max_tokens=2000,
                 messages=[{"role": "user", "content": prompt}]
             )
@@ -357,14 +404,14 @@ class LLMProcessor:
 def main():
     """Test the LLM processor with sample data."""
     # Load sample data
-    data_files = [f for f in os.listdir('data') if f.startswith('ceaf_conditions_') and f.endswith('.json')]
+    data_files = [f for f in os.listdir(DATA_DIR) if f.startswith('ceaf_conditions_') and f.endswith('.json')]
     
     if not data_files:
         print("No scraped data found. Run scraper.py first.")
         return
     
-    latest_file = sorted(data_files)[-1]
-    with open(os.path.join('data', latest_file), 'r', encoding='utf-8') as f:
+    latest_file = max(data_files)
+    with open(os.path.join(DATA_DIR, latest_file), 'r', encoding='utf-8') as f:
         scraped_data = json.load(f)
     
     # Initialize processor
@@ -375,7 +422,7 @@ def main():
     
     # Save processed data
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    output_file = f"data/processed_conditions_{timestamp}.json"
+    output_file = os.path.join(DATA_DIR, f"processed_conditions_{timestamp}.json")
     
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(processed_data, f, ensure_ascii=False, indent=2)
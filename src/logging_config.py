@@ -9,6 +9,8 @@ import sys
 from datetime import datetime
 from pathlib import Path
 
+from paths import ensure_dir
+
 
 def setup_logging(
     log_level: str = "INFO",
@@ -60,8 +62,7 @@ def setup_logging(
     # File handler with rotation
     if log_file:
         # Ensure log directory exists
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(Path(log_file).parent)
         
         file_handler = logging.handlers.RotatingFileHandler(
             log_file,
@@ -152,8 +153,7 @@ def setup_flask_logging(app):
     # File handler for Flask
     log_file = os.getenv('LOG_FILE', 'logs/flask.log')
     if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(Path(log_file).parent)
         
         file_handler = logging.handlers.RotatingFileHandler(
             log_file,
@@ -209,7 +209,8 @@ class PerformanceLogger:
     
     def __enter__(self):
         self.start_time = datetime.now()
-        self.logger.info(f"Starting operation: {self.operation_name}")
+        if __debug__ and self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"Starting operation: {self.operation_name}")
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
@@ -217,10 +218,11 @@ class PerformanceLogger:
         duration = (end_time - self.start_time).total_seconds()
         
         if exc_type is None:
-            self.logger.info(
-                f"Operation completed: {self.operation_name} "
-                f"in {duration:.2f} seconds"
-            )
+            if __debug__ and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(
+                    f"Operation completed: {self.operation_name} "
+                    f"in {duration:.2f} seconds"
+                )
         else:
             self.logger.error(
                 f"Operation failed: {self.operation_name} "
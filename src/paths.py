@@ -0,0 +1,24 @@
+"""
+Filesystem path helpers shared by the scraper, web app and logging setup.
+"""
+
+from pathlib import Path
+from typing import Set, Union
+
+# Project-level directories, anchored on this file so scripts and the web
+# app find the same files whatever the current working directory is
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+DATA_DIR = _PROJECT_ROOT / 'data'
+CACHE_DIR = _PROJECT_ROOT / 'cache'
+
+# Directories already created by this process
+_ENSURED_DIRS: Set[str] = set()
+
+
+def ensure_dir(path: Union[str, Path]) -> Path:
+    """Create a directory (and parents) once per process and return it as a Path."""
+    key = str(path)
+    if key not in _ENSURED_DIRS:
+        Path(key).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
+    return Path(key)
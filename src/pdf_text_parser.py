@@ -5,6 +5,10 @@ Simple text parser to extract structured data from PDF content when LLM is not a
 import re
 from typing import Dict, List, Any
 
+# CID-10 codes as listed in protocol headers, e.g. "ACNE GRAVE – CID-10: L70.0, L70.1 e L70.8"
+_CID_RE = re.compile(r'CID-10:\s*([A-Z]\d{2}(?:\.\d)?(?:\s*,\s*[A-Z]\d{2}(?:\.\d)?)*(?:\s*e\s*[A-Z]\d{2}(?:\.\d)?)*)')
+_CID_SPLIT_RE = re.compile(r'\s*,\s*|\s*e\s*')
+
 def parse_pdf_text(pdf_text: str, condition_name: str) -> Dict[str, Any]:
     """Parse PDF text to extract structured information."""
     
@@ -24,15 +28,12 @@ def parse_pdf_text(pdf_text: str, condition_name: str) -> Dict[str, Any]:
     
     lines = pdf_text.split('\n')
     
-    # Extract CID-10 codes
-    for line in lines:
-        # Look for CID-10 pattern in lines like "ACNE GRAVE – CID-10: L70.0, L70.1 e L70.8"
-        cid_match = re.search(r'CID-10:\s*([A-Z]\d{2}(?:\.\d)?(?:\s*,\s*[A-Z]\d{2}(?:\.\d)?)*(?:\s*e\s*[A-Z]\d{2}(?:\.\d)?)*)', line)
-        if cid_match:
-            cid_text = cid_match.group(1)
-            # Split by comma and 'e'
-            cids = re.split(r'\s*,\s*|\s*e\s*', cid_text)
-            result["cid_10"].extend([cid.strip() for cid in cids if cid.strip()])
+    # Extract CID-10 codes in a single scan over the whole text (also catches
+    # code lists that wrap onto the next line)
+    for cid_match in _CID_RE.finditer(pdf_text):
+        # Split by comma and 'e'
+        cids = _CID_SPLIT_RE.split(cid_match.group(1))
+        result["cid_10"].extend([cid.strip() for cid in cids if cid.strip()])
     
     # Extract medications
     in_medications_section = False
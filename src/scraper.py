@@ -3,113 +3,418 @@ Web scraper for CEAF clinical conditions from DF government website.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.html
+import lxml.etree
 import json
 import time
+import random
 import logging
-from typing import List, Dict, Optional
-from urllib.parse import urljoin, urlparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+import multiprocessing
+from typing import List, Dict, Optional, Set, Tuple, Union
+from urllib.parse import urljoin, urlparse, unquote_plus
 import os
 from datetime import datetime
+from pathlib import Path
 import io
+import re
+import tempfile
+import itertools
+import functools
+import importlib.metadata
+import hashlib
 import PyPDF2
 import pdfplumber
+
+try:
+    import fitz  # PyMuPDF
+    FITZ_AVAILABLE = True
+except ImportError:
+    FITZ_AVAILABLE = False
+    logging.warning("PyMuPDF not available, using pdfplumber. Install with: pip install pymupdf")
+
+# Permissively licensed alternative engine for installs without PyMuPDF (AGPL)
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logging.warning("orjson not available, using stdlib json. Install with: pip install orjson")
+
 from llm_processor import LLMProcessor
 from pdf_text_parser import parse_pdf_text
+from paths import CACHE_DIR, DATA_DIR, ensure_dir
+from content_cache import PDFCache
+
+# Pages are served as UTF-8; don't let libxml2 guess from missing meta tags.
+# Comments and processing instructions are never read, so don't build nodes for them.
+_HTML_PARSER = lxml.html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+
+
+def _class_xpath(class_name: str) -> str:
+    """XPath equivalent of the CSS class selector `.class_name`."""
+    return f"//*[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+
+
+# XPath equivalents of the CSS selectors tried for titles and main content,
+# compiled once instead of on every condition page
+_TITLE_XPATHS = [lxml.etree.XPath(path) for path in
+                 ('//h1', '//h2', _class_xpath('page-title'), _class_xpath('entry-title'))]
+_CONTENT_XPATHS = [lxml.etree.XPath(path) for path in
+                   (_class_xpath('content'), _class_xpath('entry-content'),
+                    _class_xpath('post-content'), '//main', '//article')]
+_PARAGRAPH_XPATH = lxml.etree.XPath('.//p | .//div | .//li')
+_LINK_XPATH = lxml.etree.XPath('.//a[@href]')
+# Links whose href contains ".pdf" in any case, filtered inside libxml2
+_PDF_LINK_XPATH = lxml.etree.XPath(".//a[contains(translate(@href, 'PDF', 'pdf'), '.pdf')]")
+
+# Markers for the CEAF section header on the protocols page, matched against
+# the raw UTF-8 response body so no page text has to be materialised
+_HEADER_RE = re.compile((
+    r'Condições Clínicas atendidas no Componente Especializado'
+    r'|CEAF'
+    r'|Componente Especializado da Assistência Farmacêutica'
+).encode('utf-8'))
+
+# Navigation/utility link texts that are never condition names
+_SKIP_RE = re.compile(r'download|voltar|início|home|menu|buscar|pesquisar', re.IGNORECASE)
+
+# URL fragments of protocol pages, used by the fallback condition scan
+_PROTOCOL_URL_RE = re.compile(r'protocolo|pcdt|diretriz', re.IGNORECASE)
+
+# First and last entries of the condition list ("Acne Grave" ... "Uveítes")
+_START_MARKER_RE = re.compile(r'(?=.*acne)(?=.*grave)', re.IGNORECASE | re.DOTALL)
+_END_MARKER_RE = re.compile(r'uveítes', re.IGNORECASE)
+
+# Removes the Symbol-font bullet (U+F0B7) that PDF extraction leaves on list items
+_BULLET_TABLE = str.maketrans('', '', '\uf0b7')
+
+# Word tokens for PDF matching; underscores count as separators as in file names
+_TOKEN_RE = re.compile(r'[^\W_]+')
+
+# Portuguese function words that would otherwise match almost any PDF
+# ("Certidão de Não Atendimento" is linked from every condition page)
+_NAME_STOPWORDS = frozenset({
+    'a', 'o', 'e', 'à', 'ao', 'aos', 'as', 'às', 'os', 'um', 'uma',
+    'de', 'da', 'do', 'das', 'dos', 'em', 'na', 'no', 'nas', 'nos',
+    'não', 'para', 'com', 'sem', 'por', 'pelo', 'pela', 'como', 'ou', 'que',
+})
+
+# Words at least this long also match by prefix, so plurals and glued
+# suffixes still count ("dislipidemia"/"dislipidemias", "tipo"/"tipo1")
+_PREFIX_MATCH_MIN_LEN = 4
+
+# Share of a condition's words a PDF link must contain to be kept
+MIN_PDF_MATCH_SCORE = 0.2
+
+# Link targets treated as downloadable documents on a condition page; a search
+# rather than an ends-with test, as the site's file URLs continue past the name
+_DOCUMENT_RE = re.compile(r'\.(?:pdf|docx?)', re.IGNORECASE)
+
+# PDFs up to this size are spooled in memory; larger ones roll over to disk
+PDF_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+# Larger PDFs are skipped rather than allowed to tie up a worker
+MAX_PDF_SIZE = 50 * 1024 * 1024
+
+# (connect, read) timeouts: fail fast on dead hosts without cutting off slow transfers
+PAGE_TIMEOUT = (10, 30)
+PDF_TIMEOUT = (10, 60)
+
+# Cached PDF text is only reused if the same extractor versions produced it
+PDF_PARSER_VERSION = '|'.join([
+    f"pymupdf={fitz.version[0]}" if FITZ_AVAILABLE else "pymupdf=none",
+    f"pypdfium2={importlib.metadata.version('pypdfium2')}" if PDFIUM_AVAILABLE else "pypdfium2=none",
+    f"pdfplumber={pdfplumber.__version__}",
+    f"PyPDF2={PyPDF2.__version__}",
+])
+
+# pdfplumber pages are split across processes only for PDFs at least this long;
+# shorter ones still go to the pool as a single job
+PARALLEL_PDF_MIN_PAGES = 3
+
+
+def _tokenize(text: str) -> Set[str]:
+    """Lower-cased word tokens of a string."""
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def _token_matches(token: str, link_tokens: Set[str]) -> bool:
+    """Whether a condition word occurs among a link's words, exactly or as a prefix either way."""
+    if token in link_tokens:
+        return True
+    if len(token) < _PREFIX_MATCH_MIN_LEN:
+        return False
+    return any(len(word) >= _PREFIX_MATCH_MIN_LEN and (word.startswith(token) or token.startswith(word))
+               for word in link_tokens)
+
+
+@functools.lru_cache(maxsize=1024)
+def _name_tokens(condition_name: str) -> frozenset:
+    """Tokens of a condition name used for PDF matching, without connectives unless nothing else is left."""
+    tokens = _tokenize(condition_name)
+    return frozenset(tokens - _NAME_STOPWORDS or tokens)
+
+
+@functools.lru_cache(maxsize=4096)
+def _absolute_url(base_url: str, href: str) -> str:
+    """Resolve a link against the site root, memoised; absolute links pass through."""
+    if href.startswith(('http://', 'https://')):
+        return href
+    return urljoin(base_url, href)
+
+
+# Neither PyMuPDF nor pdfium is thread-safe, so calls into them are
+# serialised across worker threads
+_FAST_PDF_LOCK = threading.Lock()
+
+
+def _extract_pages_fast(pdf_content: bytes, max_pages: Optional[int]) -> List[str]:
+    """Page texts from PyMuPDF, or from pypdfium2 when PyMuPDF is not installed."""
+    if FITZ_AVAILABLE:
+        with _FAST_PDF_LOCK, fitz.open(stream=pdf_content, filetype='pdf') as doc:
+            return [page.get_text('text').strip() for page in itertools.islice(doc, max_pages)]
+    
+    with _FAST_PDF_LOCK:
+        pdf = pdfium.PdfDocument(pdf_content)
+        try:
+            page_count = len(pdf) if max_pages is None else min(len(pdf), max_pages)
+            return [pdf[i].get_textpage().get_text_range().replace('\r\n', '\n').strip()
+                    for i in range(page_count)]
+        finally:
+            pdf.close()
+
+
+def _extract_pdfplumber_pages(pdf_content: bytes, start: int, stop: int) -> List[str]:
+    """Extract text from pages [start, stop) of a PDF (runs in a worker process)."""
+    with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
+        return [page.extract_text() for page in pdf.pages[start:stop]]
+
+
+def _write_jsonl(jsonl_file, conditions: List[Dict[str, any]]) -> List[Dict[str, str]]:
+    """Append conditions to an open binary JSONL file and return name/url summaries."""
+    for condition in conditions:
+        if ORJSON_AVAILABLE:
+            jsonl_file.write(orjson.dumps(condition, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE))
+        else:
+            jsonl_file.write((json.dumps(condition, ensure_ascii=False) + '\n').encode('utf-8'))
+    jsonl_file.flush()
+    return [{'name': condition['name'], 'url': condition.get('url')} for condition in conditions]
+
+
+def jsonl_to_json(jsonl_path: str, json_path: str, metadata: Optional[Dict[str, any]] = None) -> str:
+    """Fold a conditions JSONL file into the regular JSON layout, with metadata as top-level keys.
+    
+    Lines are copied through verbatim, so the conditions are never all in memory at once.
+    """
+    header = {key: value for key, value in (metadata or {}).items() if key != 'conditions'}
+    opening = json.dumps(header, ensure_ascii=False)[:-1] + (', ' if header else '') + '"conditions": ['
+    
+    with open(jsonl_path, 'rb') as src, open(json_path, 'wb') as dst:
+        dst.write(opening.encode('utf-8'))
+        first = True
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            if not first:
+                dst.write(b',')
+            dst.write(line)
+            first = False
+        dst.write(b']}')
+    
+    return json_path
 
 
 class CEAFScraper:
     """Scraper for CEAF clinical conditions and protocols."""
     
-    def __init__(self, base_url: str = "https://www.saude.df.gov.br", use_llm: bool = True):
+    def __init__(self, base_url: str = "https://www.saude.df.gov.br", use_llm: bool = True,
+                 max_retries: int = 3, max_workers: int = 8, max_concurrent_requests: int = 4,
+                 request_delay: float = 0.5, cache_dir: Optional[Union[str, Path]] = CACHE_DIR,
+                 max_pdf_pages: Optional[int] = None, http_cache_expire: Optional[int] = None):
         self.base_url = base_url
         self.target_url = f"{base_url}/protocolos-clinicos-ter-resumos-e-formularios"
-        self.session = requests.Session()
+        
+        # Optionally keep page and PDF responses in an on-disk HTTP cache for
+        # http_cache_expire seconds, so re-runs don't refetch an unchanged site
+        if http_cache_expire and cache_dir and REQUESTS_CACHE_AVAILABLE:
+            ensure_dir(cache_dir)
+            self.session = requests_cache.CachedSession(
+                os.path.join(cache_dir, 'http_cache'), backend='sqlite',
+                expire_after=http_cache_expire, allowable_methods=['GET'])
+        else:
+            if http_cache_expire and not REQUESTS_CACHE_AVAILABLE:
+                logging.warning("requests-cache not available, HTTP caching disabled. "
+                                "Install with: pip install requests-cache")
+            self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
+        # Reuse pooled keep-alive connections and let urllib3 handle retries
+        # with exponential backoff (honouring Retry-After on 429/503).
+        # requests already sends "Connection: keep-alive" and advertises
+        # gzip/deflate (and br when brotli is installed), decompressing
+        # transparently. The pool is sized so every worker thread can keep
+        # its own connection open.
+        retry_options = dict(total=max_retries, backoff_factor=1,
+                             status_forcelist=[429, 500, 502, 503, 504],
+                             allowed_methods=frozenset(['GET']))
+        try:
+            # Jitter keeps parallel workers from retrying in lockstep (urllib3 2.x)
+            retry = Retry(backoff_jitter=0.3, **retry_options)
+        except TypeError:
+            retry = Retry(**retry_options)
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(32, max_workers),
+                              max_retries=retry)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Worker threads for per-condition processing; at most
+        # max_concurrent_requests of them hit the server at any one time
+        self.max_workers = max_workers
+        self.request_delay = request_delay
+        self._request_slots = threading.BoundedSemaphore(max_concurrent_requests)
+        
         # Set up logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-        # Initialize LLM processor if requested
-        self.llm_processor = LLMProcessor() if use_llm else None
-        
-    def fetch_page(self, url: str, retries: int = 3) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page with retry logic."""
-        for attempt in range(retries):
-            try:
-                self.logger.info(f"Fetching {url} (attempt {attempt + 1})")
-                response = self.session.get(url, timeout=30)
-                response.raise_for_status()
-                response.encoding = 'utf-8'
-                
-                soup = BeautifulSoup(response.content, 'lxml')
-                return soup
-                
-            except requests.RequestException as e:
-                self.logger.warning(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < retries - 1:
-                    time.sleep(2 ** attempt)  # Exponential backoff
-                else:
-                    self.logger.error(f"Failed to fetch {url} after {retries} attempts")
-                    return None
+        # LLM processor if requested, created on first use so runs that never
+        # touch PDFs don't set up provider clients
+        self.use_llm = use_llm
+        self.cache_dir = cache_dir
+        self._llm_processor: Optional[LLMProcessor] = None
+        self._llm_lock = threading.Lock()
+        
+        # Extracted PDF text and LLM results are cached across runs unless cache_dir is None
+        self.pdf_cache = PDFCache(cache_dir) if cache_dir else None
+        
+        # Only the first max_pdf_pages pages of each PDF are extracted (None = all);
+        # the limit is part of the cache version since it changes the text
+        self.max_pdf_pages = max_pdf_pages
+        self._pdf_text_version = f"{PDF_PARSER_VERSION}|max_pages={max_pdf_pages}"
+        
+        # Worker processes for page-parallel PDF parsing, started on first use
+        # and reused for every PDF so spawn and import costs are paid once
+        self._pdf_pool: Optional[ProcessPoolExecutor] = None
+        self._pdf_pool_lock = threading.Lock()
+        
+    @property
+    def llm_processor(self) -> Optional[LLMProcessor]:
+        """The LLM processor (None when use_llm is off), created on first access."""
+        if self._llm_processor is None and self.use_llm:
+            with self._llm_lock:
+                if self._llm_processor is None:
+                    self._llm_processor = LLMProcessor(cache_dir=self.cache_dir)
+        return self._llm_processor
+    
+    def fetch_page(self, url: str) -> Optional[lxml.html.HtmlElement]:
+        """Fetch and parse a web page (retries are handled by the session adapter)."""
+        content = self._fetch_content(url)
+        if content is None:
+            return None
+        return self._parse_page(url, content)
+    
+    def _fetch_content(self, url: str) -> Optional[bytes]:
+        """Fetch the raw body of a web page, or None on failure."""
+        try:
+            if __debug__ and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"Fetching {url}")
+            response = self._get(url, timeout=PAGE_TIMEOUT)
+            response.raise_for_status()
+            return response.content
+        except requests.RequestException as e:
+            self.logger.error(f"Failed to fetch {url}: {e}")
+            return None
+    
+    def _parse_page(self, url: str, content: bytes) -> Optional[lxml.html.HtmlElement]:
+        """Parse a fetched page body into an lxml tree, or None on failure."""
+        try:
+            return lxml.html.document_fromstring(content, parser=_HTML_PARSER)
+        except lxml.etree.ParserError as e:
+            self.logger.error(f"Failed to parse {url}: {e}")
+            return None
+    
+    def _get(self, url: str, **kwargs) -> requests.Response:
+        """GET through the shared session, limiting concurrent requests to the server."""
+        with self._request_slots:
+            response = self.session.get(url, **kwargs)
+            # Short jittered pause so parallel workers don't hit the site in lockstep
+            time.sleep(random.uniform(0, self.request_delay))
+        return response
+    
+    @staticmethod
+    def _iter_links(tree: lxml.html.HtmlElement) -> List[Tuple[str, str]]:
+        """Return (text, href) pairs for every link with an href, in document order."""
+        return [(link.text_content().strip(), link.get('href', ''))
+                for link in _LINK_XPATH(tree)]
     
     def extract_clinical_conditions(self) -> List[Dict[str, str]]:
         """Extract the list of clinical conditions from the main page."""
-        soup = self.fetch_page(self.target_url)
-        if not soup:
+        content = self._fetch_content(self.target_url)
+        if content is None:
+            return []
+        tree = self._parse_page(self.target_url, content)
+        if tree is None:
             return []
         
-        conditions = []
+        # Keyed by name: first occurrence wins and insertion order is kept
+        by_name = {}
         
-        # Look for the CEAF section specifically
-        # Find the section header first
-        ceaf_section_found = False
-        ceaf_header_keywords = [
-            "Condições Clínicas atendidas no Componente Especializado",
-            "CEAF",
-            "Componente Especializado da Assistência Farmacêutica"
-        ]
+        def add_condition(name: str, href: str) -> None:
+            """Collect a condition unless one with the same name was already seen."""
+            if name not in by_name:
+                by_name[name] = {
+                    'name': name,
+                    'url': _absolute_url(self.base_url, href)
+                }
         
-        # Find all text elements that might contain the CEAF section header
-        for element in soup.find_all(text=True):
-            if any(keyword in element for keyword in ceaf_header_keywords):
-                ceaf_section_found = True
-                self.logger.info(f"Found CEAF section marker: {element.strip()}")
-                break
+        # Look for the CEAF section specifically
+        # Find the section header first (one regex scan over the raw page bytes)
+        header_match = _HEADER_RE.search(content)
+        ceaf_section_found = header_match is not None
+        if ceaf_section_found:
+            self.logger.info(f"Found CEAF section marker: {header_match.group(0).decode('utf-8')}")
         
         if not ceaf_section_found:
             self.logger.warning("Could not find CEAF section header, using fallback method")
         
         # Get all links from the page
-        all_links = soup.find_all('a', href=True)
+        all_links = self._iter_links(tree)
         
         # Find the range between "Acne Grave" and "Uveítes" 
         start_collecting = False
         acne_found = False
         
-        for link in all_links:
-            text = link.get_text(strip=True)
-            href = link.get('href', '')
-            
+        for text, href in all_links:
             # Start collecting when we find "Acne Grave"
-            if not acne_found and text and 'acne' in text.lower() and 'grave' in text.lower():
+            if not acne_found and text and _START_MARKER_RE.match(text):
                 acne_found = True
                 start_collecting = True
                 self.logger.info(f"Found start marker: {text}")
             
             # Stop collecting when we find "Uveítes"
-            if start_collecting and text and 'uveítes' in text.lower():
+            if start_collecting and text and _END_MARKER_RE.search(text):
                 # Include this last condition
                 if text and len(text) > 2:
-                    full_url = urljoin(self.base_url, href)
-                    conditions.append({
-                        'name': text,
-                        'url': full_url,
-                        'scraped_at': datetime.now().isoformat()
-                    })
+                    add_condition(text, href)
                 self.logger.info(f"Found end marker: {text}")
                 break
             
@@ -117,62 +422,42 @@ class CEAFScraper:
             if start_collecting and text and len(text) > 2:
                 # Additional filtering to ensure we're getting medical conditions
                 # Skip navigation links, downloads, etc.
-                if (not any(skip_word in text.lower() for skip_word in 
-                           ['download', 'voltar', 'início', 'home', 'menu', 'buscar', 'pesquisar']) and
+                if (not _SKIP_RE.search(text) and
                     not text.lower().startswith('http') and
                     len(text) < 100):  # Medical condition names shouldn't be too long
                     
-                    full_url = urljoin(self.base_url, href)
-                    conditions.append({
-                        'name': text,
-                        'url': full_url,
-                        'scraped_at': datetime.now().isoformat()
-                    })
+                    add_condition(text, href)
         
         # If we didn't find the range, try a fallback approach
-        if not conditions and acne_found:
+        if not by_name and acne_found:
             self.logger.warning("Range method failed, trying pattern-based fallback")
-            for link in all_links:
-                text = link.get_text(strip=True)
-                href = link.get('href', '').lower()
-                
+            for text, href in all_links:
                 # Look for links that seem like medical conditions
                 if (text and len(text) > 3 and len(text) < 100 and
                     # Must contain medical/protocol keywords in URL
-                    any(keyword in href for keyword in ['protocolo', 'pcdt', 'diretriz']) and
+                    _PROTOCOL_URL_RE.search(href) and
                     # Skip obvious navigation elements
-                    not any(skip_word in text.lower() for skip_word in 
-                           ['download', 'voltar', 'início', 'home', 'menu', 'buscar'])):
+                    not _SKIP_RE.search(text)):
                     
-                    full_url = urljoin(self.base_url, href)
-                    conditions.append({
-                        'name': text,
-                        'url': full_url,
-                        'scraped_at': datetime.now().isoformat()
-                    })
-        
-        # Remove duplicates based on name
-        unique_conditions = []
-        seen_names = set()
-        for condition in conditions:
-            if condition['name'] not in seen_names:
-                unique_conditions.append(condition)
-                seen_names.add(condition['name'])
-        
-        self.logger.info(f"Found {len(unique_conditions)} unique clinical conditions")
-        
-        # Log first few conditions for debugging
-        if unique_conditions:
+                    add_condition(text, href)
+        
+        conditions = list(by_name.values())
+        self.logger.info(f"Found {len(conditions)} unique clinical conditions")
+        
+        # Log first few conditions for debugging (stripped under python -O)
+        if __debug__ and conditions and self.logger.isEnabledFor(logging.INFO):
             self.logger.info("First few conditions found:")
-            for i, condition in enumerate(unique_conditions[:5]):
+            for i, condition in enumerate(conditions[:5]):
                 self.logger.info(f"  {i+1}. {condition['name']}")
         
-        return unique_conditions
+        return conditions
     
-    def extract_condition_details(self, condition_url: str) -> Dict[str, any]:
-        """Extract detailed information from a specific condition page."""
-        soup = self.fetch_page(condition_url)
-        if not soup:
+    def extract_condition_details(self, condition_url: str,
+                                  tree: Optional[lxml.html.HtmlElement] = None) -> Dict[str, any]:
+        """Extract detailed information from a specific condition page (fetched unless tree is given)."""
+        if tree is None:
+            tree = self.fetch_page(condition_url)
+        if tree is None:
             return {}
         
         details = {
@@ -185,23 +470,21 @@ class CEAFScraper:
         }
         
         # Extract title
-        title_selectors = ['h1', 'h2', '.page-title', '.entry-title']
-        for selector in title_selectors:
-            title_elem = soup.select_one(selector)
-            if title_elem:
-                details['title'] = title_elem.get_text(strip=True)
+        for xpath in _TITLE_XPATHS:
+            title_elems = xpath(tree)
+            if title_elems:
+                details['title'] = title_elems[0].text_content().strip()
                 break
         
         # Extract main content
-        content_selectors = ['.content', '.entry-content', '.post-content', 'main', 'article']
-        for selector in content_selectors:
-            content_elem = soup.select_one(selector)
-            if content_elem:
+        for xpath in _CONTENT_XPATHS:
+            content_elems = xpath(tree)
+            if content_elems:
                 # Extract text content
-                paragraphs = content_elem.find_all(['p', 'div', 'li'])
+                paragraphs = _PARAGRAPH_XPATH(content_elems[0])
                 description_parts = []
                 for p in paragraphs[:5]:  # Limit to first 5 paragraphs
-                    text = p.get_text(strip=True)
+                    text = p.text_content().strip()
                     if text and len(text) > 20:
                         description_parts.append(text)
                 
@@ -209,64 +492,61 @@ class CEAFScraper:
                 break
         
         # Extract downloadable documents
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            if any(ext in href.lower() for ext in ['.pdf', '.doc', '.docx']):
+        for text, href in self._iter_links(tree):
+            if _DOCUMENT_RE.search(href):
                 details['documents'].append({
                     'name': text,
-                    'url': urljoin(self.base_url, href)
+                    'url': _absolute_url(self.base_url, href)
                 })
         
         return details
     
-    def find_condition_pdfs(self, condition_url: str, condition_name: str) -> List[Dict[str, str]]:
+    def find_condition_pdfs(self, condition_url: str, condition_name: str,
+                            tree: Optional[lxml.html.HtmlElement] = None) -> List[Dict[str, str]]:
         """Find ALL PDF URLs for a specific condition on its page that match the condition name."""
-        soup = self.fetch_page(condition_url)
-        if not soup:
+        if tree is None:
+            tree = self.fetch_page(condition_url)
+        if tree is None:
             return []
         
         pdf_links = []
         
         # Find all PDF links on the page
-        for link in soup.find_all('a', href=True):
-            href = link.get('href', '')
-            text = link.get_text(strip=True)
-            
-            if '.pdf' in href.lower():
-                pdf_url = urljoin(self.base_url, href)
-                pdf_links.append({
-                    'url': pdf_url,
-                    'text': text,
-                    'href': href
-                })
+        for link in _PDF_LINK_XPATH(tree):
+            href = link.get('href')
+            pdf_links.append({
+                'url': _absolute_url(self.base_url, href),
+                'text': link.text_content().strip(),
+                'href': href
+            })
         
         if not pdf_links:
             self.logger.warning(f"No PDF links found for {condition_name}")
             return []
         
-        # Filter PDFs that match the condition name
-        condition_words = set(condition_name.lower().split())
+        # Score each PDF by the share of the condition's words found in its
+        # link text or decoded file name
+        condition_tokens = _name_tokens(condition_name)
         matching_pdfs = []
         
         for pdf_link in pdf_links:
-            pdf_text = pdf_link['text'].lower()
-            pdf_href = pdf_link['href'].lower()
-            
-            # Check if condition words appear in PDF link text or URL
-            matches = 0
-            for word in condition_words:
-                if word in pdf_text or word in pdf_href:
-                    matches += 1
+            text_tokens = _tokenize(pdf_link['text'])
+            link_tokens = text_tokens | _tokenize(unquote_plus(pdf_link['href']))
+            matched = sum(1 for token in condition_tokens if _token_matches(token, link_tokens))
+            score = matched / len(condition_tokens) if condition_tokens else 0
             
-            score = matches / len(condition_words) if condition_words else 0
+            # Annexes ("... (Anexo II)") are forms attached to the protocol on
+            # this page even when they only name a drug or a form
+            if score < MIN_PDF_MATCH_SCORE and 'anexo' in text_tokens:
+                score = MIN_PDF_MATCH_SCORE
             
-            # Include PDFs with at least 30% word match
-            if score > 0.3:
+            # Site-wide footer PDFs ("Manual de Visitantes", "Certidão de Não
+            # Atendimento") share no words with a condition once stopwords are gone
+            if score >= MIN_PDF_MATCH_SCORE:
                 pdf_link['match_score'] = score
                 matching_pdfs.append(pdf_link)
-                self.logger.info(f"Found matching PDF for {condition_name}: {pdf_link['text']} (score: {score:.2f})")
+                if __debug__ and self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(f"Found matching PDF for {condition_name}: {pdf_link['text']} (score: {score:.2f})")
         
         # If no good matches, include the first PDF as fallback
         if not matching_pdfs and pdf_links:
@@ -288,40 +568,140 @@ class CEAFScraper:
         """Download PDF content from URL."""
         try:
             self.logger.info(f"Downloading PDF from {pdf_url}")
-            response = self.session.get(pdf_url, timeout=60)
-            response.raise_for_status()
-            
-            if 'application/pdf' not in response.headers.get('Content-Type', ''):
-                self.logger.warning(f"URL may not be a PDF: {pdf_url}")
-            
-            return response.content
+            with self._get(pdf_url, timeout=PDF_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                
+                if 'application/pdf' not in response.headers.get('Content-Type', ''):
+                    self.logger.warning(f"URL may not be a PDF: {pdf_url}")
+                
+                return b''.join(self._iter_pdf_chunks(response))
         except Exception as e:
             self.logger.error(f"Failed to download PDF from {pdf_url}: {e}")
             return None
     
+    @staticmethod
+    def _iter_pdf_chunks(response: requests.Response):
+        """Yield a streamed PDF body in chunks, aborting once it exceeds MAX_PDF_SIZE."""
+        content_length = response.headers.get('Content-Length', '')
+        if content_length.isdigit() and int(content_length) > MAX_PDF_SIZE:
+            raise ValueError(f"PDF too large ({content_length} bytes)")
+        
+        size = 0
+        # iter_content (unlike response.raw) undoes any Content-Encoding
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            size += len(chunk)
+            if size > MAX_PDF_SIZE:
+                raise ValueError(f"PDF larger than {MAX_PDF_SIZE} bytes")
+            yield chunk
+    
+    def fetch_and_extract_pdf(self, pdf_url: str) -> Optional[str]:
+        """Stream a PDF into a spooled temp file and extract its text; None if the download fails."""
+        # Only revalidate when we still hold (non-empty) text for what the URL last served
+        headers = {}
+        if self.pdf_cache:
+            cached_text = self.pdf_cache.get_url_text(pdf_url, self._pdf_text_version)
+            if cached_text:
+                headers = self.pdf_cache.conditional_headers(pdf_url)
+        
+        pdf_file = tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_SIZE)
+        digest = hashlib.sha256()
+        try:
+            self.logger.info(f"Downloading PDF from {pdf_url}")
+            with self._get(pdf_url, timeout=PDF_TIMEOUT, stream=True, headers=headers) as response:
+                if headers and response.status_code == 304:
+                    self.logger.info(f"PDF not modified, using cached text: {pdf_url}")
+                    pdf_file.close()
+                    return cached_text
+                
+                response.raise_for_status()
+                
+                if 'application/pdf' not in response.headers.get('Content-Type', ''):
+                    self.logger.warning(f"URL may not be a PDF: {pdf_url}")
+                
+                for chunk in self._iter_pdf_chunks(response):
+                    pdf_file.write(chunk)
+                    digest.update(chunk)
+        except Exception as e:
+            self.logger.error(f"Failed to download PDF from {pdf_url}: {e}")
+            pdf_file.close()
+            return None
+        
+        content_hash = digest.hexdigest()
+        with pdf_file:
+            text = self._extract_pdf_text_cached(pdf_file, content_hash)
+        
+        # Record the validators only once there is text behind them, so a failed
+        # extraction is retried on the next run instead of being served on every 304
+        if self.pdf_cache and text:
+            self.pdf_cache.set_url(pdf_url, content_hash,
+                                   etag=response.headers.get('ETag'),
+                                   last_modified=response.headers.get('Last-Modified'))
+        return text
+    
     def extract_pdf_text(self, pdf_content: bytes) -> str:
         """Extract text from PDF content."""
-        try:
-            # Try with pdfplumber first (better for tables and formatted text)
-            with pdfplumber.open(io.BytesIO(pdf_content)) as pdf:
-                text_parts = []
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_parts.append(page_text)
+        content_hash = hashlib.sha256(pdf_content).hexdigest()
+        return self._extract_pdf_text_cached(io.BytesIO(pdf_content), content_hash)
+    
+    def _extract_pdf_text_cached(self, pdf_file, content_hash: str) -> str:
+        """Extract text from a PDF file object, reusing cached text for identical content."""
+        if self.pdf_cache:
+            cached_text = self.pdf_cache.get_text(content_hash, self._pdf_text_version)
+            if cached_text:
+                return cached_text
+        
+        text = self._extract_pdf_file_text(pdf_file)
+        # Empty text means every engine failed; don't make that permanent
+        if self.pdf_cache and text:
+            self.pdf_cache.set_text(content_hash, text, self._pdf_text_version)
+        return text
+    
+    def _extract_pdf_file_text(self, pdf_file) -> str:
+        """Extract text from a seekable PDF file object (first max_pdf_pages pages only, if set)."""
+        max_pages = self.max_pdf_pages
+        
+        if FITZ_AVAILABLE or PDFIUM_AVAILABLE:
+            # The C engines are much faster; pdfplumber still handles files they find no text in
+            try:
+                pdf_file.seek(0)
+                text_parts = _extract_pages_fast(pdf_file.read(), max_pages)
                 
-                if text_parts:
-                    return '\n\n'.join(text_parts)
+                text = '\n\n'.join(part for part in text_parts if part)
+                if text:
+                    return text
+            except Exception as e:
+                self.logger.warning(f"Fast PDF extraction failed, trying pdfplumber: {e}")
+        
+        try:
+            # Then pdfplumber (better for tables and formatted text)
+            pdf_file.seek(0)
+            with pdfplumber.open(pdf_file) as pdf:
+                pages = pdf.pages[:max_pages]
+                page_count = len(pages)
+                # Parsing holds the GIL, so on multi-core machines every PDF goes to
+                # the shared process pool and concurrent conditions parse in parallel
+                if page_count == 0 or (os.cpu_count() or 1) <= 2:
+                    page_texts = [page.extract_text() for page in pages]
+                else:
+                    page_texts = None
+            
+            if page_texts is None:
+                page_texts = self._extract_pdfplumber_parallel(pdf_file, page_count)
+            
+            text_parts = [page_text for page_text in page_texts if page_text]
+            if text_parts:
+                return '\n\n'.join(text_parts)
             
         except Exception as e:
             self.logger.warning(f"pdfplumber failed, trying PyPDF2: {e}")
             
-            # Fallback to PyPDF2
+            # Fallback to PyPDF2, rereading the same handle
             try:
-                pdf_reader = PyPDF2.PdfReader(io.BytesIO(pdf_content))
+                pdf_file.seek(0)
+                pdf_reader = PyPDF2.PdfReader(pdf_file)
                 text_parts = []
                 
-                for page in pdf_reader.pages:
+                for page in pdf_reader.pages[:max_pages]:
                     page_text = page.extract_text()
                     if page_text:
                         text_parts.append(page_text)
@@ -334,147 +714,187 @@ class CEAFScraper:
         
         return ""
     
+    def _get_pdf_pool(self) -> ProcessPoolExecutor:
+        """Return the shared PDF worker pool, starting it on first use."""
+        with self._pdf_pool_lock:
+            if self._pdf_pool is None:
+                # spawn rather than fork: the scraper is multi-threaded by now
+                self._pdf_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+            return self._pdf_pool
+    
+    def _extract_pdfplumber_parallel(self, pdf_file, page_count: int) -> List[str]:
+        """Run pdfplumber over disjoint page ranges (one range for short PDFs) in the PDF worker pool."""
+        pdf_file.seek(0)
+        pdf_content = pdf_file.read()
+        workers = min(os.cpu_count() or 1, page_count) if page_count >= PARALLEL_PDF_MIN_PAGES else 1
+        step = -(-page_count // workers)
+        
+        executor = self._get_pdf_pool()
+        futures = [
+            executor.submit(_extract_pdfplumber_pages, pdf_content, start, min(start + step, page_count))
+            for start in range(0, page_count, step)
+        ]
+        return [page_text for future in futures for page_text in future.result()]
+    
+    def close(self) -> None:
+        """Shut down the PDF worker pool and close the HTTP session."""
+        with self._pdf_pool_lock:
+            if self._pdf_pool is not None:
+                self._pdf_pool.shutdown()
+                self._pdf_pool = None
+        self.session.close()
+    
+    def __enter__(self) -> 'CEAFScraper':
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def create_custom_description(self, condition: Dict[str, any]) -> str:
         """Create custom description with medications and CID-10 codes."""
         description_parts = []
         
         # Add medications if available
         if condition.get('medicamentos'):
-            medications = [med.replace('\uf0b7', '').strip() for med in condition['medicamentos']]
-            medications = [med for med in medications if med]  # Remove empty strings
+            # Drop PDF bullet glyphs and empty entries in one pass
+            medications = [med for med in (item.translate(_BULLET_TABLE).strip()
+                                           for item in condition['medicamentos']) if med]
             if medications:
                 description_parts.append(', '.join(medications))
         
         # Add CID-10 codes if available
         if condition.get('cid_10'):
-            cid_codes = [code.strip() for code in condition['cid_10']]
-            cid_codes = [code for code in cid_codes if code]  # Remove empty strings
+            cid_codes = [code for code in (item.strip() for item in condition['cid_10']) if code]
             if cid_codes:
                 description_parts.append(', '.join(cid_codes))
         
         return '\n'.join(description_parts) if description_parts else condition.get('description', '')
     
-    def scrape_all_conditions(self, include_details: bool = False, include_pdf_data: bool = False) -> Dict[str, any]:
-        """Scrape all clinical conditions and optionally their details."""
+    def _process_pdf(self, base_condition: Dict[str, any], pdf_link: Dict[str, str]) -> Dict[str, any]:
+        """Build the condition entry for one of its PDFs."""
+        self.logger.info(f"Processing PDF: {pdf_link['text']}")
+        condition = {**base_condition, 'pdf_url': pdf_link['url'], 'pdf_name': pdf_link['text']}
+        
+        pdf_text = self.fetch_and_extract_pdf(pdf_link['url'])
+        if pdf_text is not None:
+            condition['pdf_text'] = pdf_text
+            condition['pdf_extracted'] = True
+            
+            # Extract structured data using LLM if available, otherwise use text parser
+            if self.llm_processor and pdf_text.strip():
+                try:
+                    structured_data = self.llm_processor.extract_pdf_structured_data(
+                        pdf_text, condition['name']
+                    )
+                    condition.update(structured_data)
+                except Exception as e:
+                    self.logger.warning(f"LLM extraction failed for {condition['name']}, using text parser: {e}")
+                    # Fallback to text parser
+                    structured_data = parse_pdf_text(pdf_text, condition['name'])
+                    condition.update(structured_data)
+            elif pdf_text.strip():
+                # Use text parser when LLM is not available
+                structured_data = parse_pdf_text(pdf_text, condition['name'])
+                condition.update(structured_data)
+        else:
+            condition['pdf_extracted'] = False
+        
+        # Update description with custom format
+        condition['description'] = self.create_custom_description(condition)
+        return condition
+    
+    def _process_condition(self, base_condition: Dict[str, any], include_details: bool,
+                           include_pdf_data: bool) -> List[Dict[str, any]]:
+        """Process a single base condition, returning one entry per matching PDF."""
+        results = []
+        
+        # Fetch and parse the condition page once for both details and PDFs
+        tree = None
+        if include_details or include_pdf_data:
+            tree = self.fetch_page(base_condition['url'])
+        
+        # Extract basic details first
+        if include_details and tree is not None:
+            details = self.extract_condition_details(base_condition['url'], tree=tree)
+            base_condition.update(details)
+        
+        if include_pdf_data:
+            # Find ALL PDFs for this condition
+            pdf_links = []
+            if tree is not None:
+                pdf_links = self.find_condition_pdfs(base_condition['url'], base_condition['name'], tree=tree)
+            
+            if pdf_links:
+                # One entry per PDF, each starting from the page-level data
+                for pdf_link in pdf_links:
+                    results.append(self._process_pdf(base_condition, pdf_link))
+            else:
+                # No PDFs found, add the condition as-is
+                base_condition['pdf_extracted'] = False
+                results.append(base_condition)
+        else:
+            # Not processing PDFs, add the condition as-is
+            results.append(base_condition)
+        
+        return results
+    
+    def scrape_all_conditions(self, include_details: bool = False, include_pdf_data: bool = False,
+                              jsonl_path: Optional[str] = None) -> Dict[str, any]:
+        """Scrape all clinical conditions and optionally their details.
+        
+        With jsonl_path, every finished condition is appended to that file as one
+        JSON line (in page order) and only its name and url are kept in the
+        returned data; jsonl_to_json() folds the file into the usual format.
+        """
         self.logger.info("Starting CEAF conditions scraping...")
         
         # Get the list of conditions
         base_conditions = self.extract_clinical_conditions()
         all_conditions = []
         
-        if include_details or include_pdf_data:
-            self.logger.info("Extracting detailed information for each condition...")
-            for i, base_condition in enumerate(base_conditions):
-                self.logger.info(f"Processing condition {i+1}/{len(base_conditions)}: {base_condition['name']}")
-                
-                # Extract basic details first
-                if include_details:
-                    details = self.extract_condition_details(base_condition['url'])
-                    base_condition.update(details)
+        jsonl_file = open(jsonl_path, 'wb') if jsonl_path else None
+        try:
+            if include_details or include_pdf_data:
+                self.logger.info("Extracting detailed information for each condition...")
                 
-                if include_pdf_data:
-                    # Find ALL PDFs for this condition
-                    pdf_links = self.find_condition_pdfs(base_condition['url'], base_condition['name'])
-                    
-                    if pdf_links:
-                        # Process the first PDF and create the base condition
-                        first_pdf = pdf_links[0]
-                        condition_copy = base_condition.copy()
-                        
-                        self.logger.info(f"Processing first PDF: {first_pdf['text']}")
-                        condition_copy['pdf_url'] = first_pdf['url']
-                        condition_copy['pdf_name'] = first_pdf['text']
+                # Conditions are I/O bound, so process them on a thread pool; the
+                # request semaphore in _get() keeps the load on the server bounded
+                total = len(base_conditions)
+                processed = [None] * total
+                next_to_write = 0
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    futures = {
+                        executor.submit(self._process_condition, condition, include_details, include_pdf_data): i
+                        for i, condition in enumerate(base_conditions)
+                    }
+                    for done, future in enumerate(as_completed(futures), 1):
+                        i = futures[future]
+                        try:
+                            processed[i] = future.result()
+                        except Exception as e:
+                            self.logger.error(f"Failed to process {base_conditions[i]['name']}: {e}")
+                            base_conditions[i]['pdf_extracted'] = False
+                            processed[i] = [base_conditions[i]]
+                        self.logger.info(f"Processed condition {done}/{total}: {base_conditions[i]['name']}")
                         
-                        pdf_content = self.download_pdf(first_pdf['url'])
-                        if pdf_content:
-                            pdf_text = self.extract_pdf_text(pdf_content)
-                            condition_copy['pdf_text'] = pdf_text
-                            condition_copy['pdf_extracted'] = True
-                            
-                            # Extract structured data using LLM if available, otherwise use text parser
-                            if self.llm_processor and pdf_text.strip():
-                                try:
-                                    structured_data = self.llm_processor.extract_pdf_structured_data(
-                                        pdf_text, condition_copy['name']
-                                    )
-                                    condition_copy.update(structured_data)
-                                except Exception as e:
-                                    self.logger.warning(f"LLM extraction failed for {condition_copy['name']}, using text parser: {e}")
-                                    # Fallback to text parser
-                                    structured_data = parse_pdf_text(pdf_text, condition_copy['name'])
-                                    condition_copy.update(structured_data)
-                            elif pdf_text.strip():
-                                # Use text parser when LLM is not available
-                                structured_data = parse_pdf_text(pdf_text, condition_copy['name'])
-                                condition_copy.update(structured_data)
-                        else:
-                            condition_copy['pdf_extracted'] = False
-                        
-                        # Update description with custom format
-                        condition_copy['description'] = self.create_custom_description(condition_copy)
-                        all_conditions.append(condition_copy)
-                        
-                        # Process additional PDFs (if any) by duplicating the condition
-                        for additional_pdf in pdf_links[1:]:
-                            self.logger.info(f"Processing additional PDF: {additional_pdf['text']}")
-                            
-                            # Create a duplicate condition without the PDF-extracted data
-                            duplicate_condition = base_condition.copy()
-                            
-                            # Keep basic details but remove PDF-specific data from the first PDF
-                            pdf_specific_keys = ['cid_10', 'medicamentos', 'documentos_pessoais', 
-                                               'documentos_medicos', 'exames', 'observacoes', 
-                                               'extraction_method', 'pdf_text', 'pdf_url', 'pdf_name']
-                            for key in pdf_specific_keys:
-                                if key in duplicate_condition:
-                                    del duplicate_condition[key]
-                            
-                            # Process the additional PDF
-                            duplicate_condition['pdf_url'] = additional_pdf['url']
-                            duplicate_condition['pdf_name'] = additional_pdf['text']
-                            
-                            pdf_content = self.download_pdf(additional_pdf['url'])
-                            if pdf_content:
-                                pdf_text = self.extract_pdf_text(pdf_content)
-                                duplicate_condition['pdf_text'] = pdf_text
-                                duplicate_condition['pdf_extracted'] = True
-                                
-                                # Extract structured data
-                                if self.llm_processor and pdf_text.strip():
-                                    try:
-                                        structured_data = self.llm_processor.extract_pdf_structured_data(
-                                            pdf_text, duplicate_condition['name']
-                                        )
-                                        duplicate_condition.update(structured_data)
-                                    except Exception as e:
-                                        self.logger.warning(f"LLM extraction failed for additional PDF, using text parser: {e}")
-                                        structured_data = parse_pdf_text(pdf_text, duplicate_condition['name'])
-                                        duplicate_condition.update(structured_data)
-                                elif pdf_text.strip():
-                                    structured_data = parse_pdf_text(pdf_text, duplicate_condition['name'])
-                                    duplicate_condition.update(structured_data)
-                            else:
-                                duplicate_condition['pdf_extracted'] = False
-                            
-                            # Update description with custom format
-                            duplicate_condition['description'] = self.create_custom_description(duplicate_condition)
-                            all_conditions.append(duplicate_condition)
-                            
-                            # Brief pause between PDFs
-                            time.sleep(1)
-                    else:
-                        # No PDFs found, add the condition as-is
-                        base_condition['pdf_extracted'] = False
-                        all_conditions.append(base_condition)
-                else:
-                    # Not processing PDFs, add the condition as-is
-                    all_conditions.append(base_condition)
+                        # Stream out every condition that is now complete in page order
+                        if jsonl_file:
+                            while next_to_write < total and processed[next_to_write] is not None:
+                                processed[next_to_write] = _write_jsonl(jsonl_file, processed[next_to_write])
+                                next_to_write += 1
                 
-                # Be respectful to the server
-                time.sleep(2)
-        else:
-            # No details or PDF processing, just return the base conditions
-            all_conditions = base_conditions
+                # Keep the original page order in the output
+                for results in processed:
+                    all_conditions.extend(results)
+            else:
+                # No details or PDF processing, just return the base conditions
+                all_conditions = base_conditions
+                if jsonl_file:
+                    all_conditions = _write_jsonl(jsonl_file, base_conditions)
+        finally:
+            if jsonl_file:
+                jsonl_file.close()
         
         result = {
             'scraped_at': datetime.now().isoformat(),
@@ -486,18 +906,30 @@ class CEAFScraper:
         
         return result
     
-    def save_data(self, data: Dict[str, any], filename: str = None) -> str:
-        """Save scraped data to JSON file."""
+    def save_data(self, data: Dict[str, any], filename: str = None, indent: Optional[int] = None) -> str:
+        """Save scraped data to JSON file (compact unless an indent is given)."""
         if not filename:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"ceaf_conditions_{timestamp}.json"
         
         # Ensure data directory exists
-        os.makedirs('data', exist_ok=True)
-        filepath = os.path.join('data', filename)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        ensure_dir(DATA_DIR)
+        filepath = os.path.join(DATA_DIR, filename)
+        
+        # orjson encodes straight to UTF-8 bytes in C; it only supports
+        # compact output or a 2-space indent
+        if ORJSON_AVAILABLE and indent in (None, 2):
+            option = orjson.OPT_NON_STR_KEYS
+            if indent == 2:
+                option |= orjson.OPT_INDENT_2
+            with open(filepath, 'wb') as f:
+                f.write(orjson.dumps(data, option=option))
+        else:
+            # json.dump writes the encoder's chunks as they are produced, so the
+            # whole document never exists as a single string in memory
+            separators = (',', ':') if indent is None else None
+            with open(filepath, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, indent=indent, separators=separators)
         
         self.logger.info(f"Data saved to {filepath}")
         return filepath
@@ -505,13 +937,12 @@ class CEAFScraper:
 
 def main():
     """Main function to run the scraper."""
-    scraper = CEAFScraper()
-    
-    # Scrape basic condition list
-    data = scraper.scrape_all_conditions(include_details=False)
-    
-    # Save the data
-    filepath = scraper.save_data(data)
+    with CEAFScraper() as scraper:
+        # Scrape basic condition list
+        data = scraper.scrape_all_conditions(include_details=False)
+        
+        # Save the data
+        filepath = scraper.save_data(data)
     
     print(f"Scraping completed!")
     print(f"Found {data['total_conditions']} clinical conditions")
@@ -14,6 +14,42 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from app import DataManager
 
+NO_DESC_HTML = '<p class="text-muted small mb-0">Sem descrição disponível</p>'
+
+def format_description_python(description):
+    """Python version of the JavaScript formatDescription function."""
+    if not description:
+        return NO_DESC_HTML
+    
+    # Strip each line once and keep the non-empty ones
+    lines = [line for line in map(str.strip, description.split('\n')) if line]
+    
+    if len(lines) == 0:
+        return NO_DESC_HTML
+    
+    if len(lines) == 1:
+        line = lines[0]
+        if len(line) > 120:
+            return f'<p class="text-muted small mb-0">{line[:120]}...</p>'
+        return f'<p class="text-muted small mb-0">{line}</p>'
+    
+    html_parts = []
+    
+    # First line - medications
+    if lines[0]:
+        medications = lines[0]
+        if len(medications) > 60:
+            medications = medications[:60] + '...'
+        html_parts.append(f'<p class="text-muted small mb-1"><i class="fas fa-pills me-1 text-success"></i><strong>Medicamentos:</strong> {medications}</p>')
+    
+    # Second line - CID-10
+    if len(lines) > 1 and lines[1]:
+        cid_codes = lines[1]
+        html_parts.append(f'<p class="text-muted small mb-0"><i class="fas fa-code me-1 text-info"></i><strong>CID-10:</strong> {cid_codes}</p>')
+    
+    return ''.join(html_parts)
+
+
 def test_description_display():
     """Test if descriptions are properly formatted and displayed."""
     print("🔍 Testing Description Display Functionality")
@@ -30,20 +66,22 @@ def test_description_display():
     conditions = scraped_data.get('conditions', [])
     print(f"📊 Total conditions: {len(conditions)}")
     
-    # Find conditions with descriptions
-    conditions_with_descriptions = [c for c in conditions if c.get('description')]
-    print(f"📝 Conditions with descriptions: {len(conditions_with_descriptions)}")
-    
-    # Find conditions with custom format descriptions (our format)
+    # Find conditions with descriptions, and among them those in the custom
+    # format (medications, CID-10), in one pass over the conditions
+    conditions_with_descriptions = []
     custom_format_conditions = []
-    for condition in conditions_with_descriptions:
-        desc = condition['description']
-        if '\n' in desc and len(desc.split('\n')) >= 2:
-            lines = desc.split('\n')
-            # Check if it looks like our format (medications, CID-10)
-            if lines[0].strip() and lines[1].strip():
-                custom_format_conditions.append(condition)
+    for condition in conditions:
+        desc = condition.get('description')
+        if not desc:
+            continue
+        conditions_with_descriptions.append(condition)
+        
+        # Only the first two lines matter, so split at most twice
+        lines = desc.split('\n', 2)
+        if len(lines) >= 2 and lines[0].strip() and lines[1].strip():
+            custom_format_conditions.append(condition)
     
+    print(f"📝 Conditions with descriptions: {len(conditions_with_descriptions)}")
     print(f"🎯 Conditions with custom format descriptions: {len(custom_format_conditions)}")
     
     if not conditions_with_descriptions:
@@ -58,14 +96,14 @@ def test_description_display():
     # Show sample descriptions
     for i, condition in enumerate(conditions_with_descriptions[:5]):
         print(f"\n{i+1}. Condition: {condition['name']}")
-        print(f"   Description: {repr(condition['description'])}")
+        desc = condition['description']
+        print(f"   Description: {desc[:200]!r}{'...' if len(desc) > 200 else ''}")
         
         # Analyze the format
-        desc = condition['description']
         lines = desc.split('\n') if desc else []
         print(f"   Lines: {len(lines)}")
         
-        for j, line in enumerate(lines):
+        for j, line in enumerate(lines[:10]):
             if line.strip():
                 print(f"   Line {j+1}: {line.strip()}")
         
@@ -84,45 +122,13 @@ def test_description_display():
     print(f"\n🧪 Testing JavaScript formatDescription logic:")
     print("=" * 50)
     
-    def format_description_python(description):
-        """Python version of the JavaScript formatDescription function."""
-        if not description:
-            return '<p class="text-muted small mb-0">Sem descrição disponível</p>'
-        
-        lines = [line.strip() for line in description.split('\n') if line.strip()]
-        
-        if len(lines) == 0:
-            return '<p class="text-muted small mb-0">Sem descrição disponível</p>'
-        
-        if len(lines) == 1:
-            line = lines[0]
-            if len(line) > 120:
-                return f'<p class="text-muted small mb-0">{line[:120]}...</p>'
-            return f'<p class="text-muted small mb-0">{line}</p>'
-        
-        html = ''
-        
-        # First line - medications
-        if lines[0]:
-            medications = lines[0]
-            if len(medications) > 60:
-                medications = medications[:60] + '...'
-            html += f'<p class="text-muted small mb-1"><i class="fas fa-pills me-1 text-success"></i><strong>Medicamentos:</strong> {medications}</p>'
-        
-        # Second line - CID-10
-        if len(lines) > 1 and lines[1]:
-            cid_codes = lines[1]
-            html += f'<p class="text-muted small mb-0"><i class="fas fa-code me-1 text-info"></i><strong>CID-10:</strong> {cid_codes}</p>'
-        
-        return html
-    
     # Test with sample conditions
     for i, condition in enumerate(custom_format_conditions[:3]):
         print(f"\n📄 Test {i+1}: {condition['name']}")
         desc = condition['description']
         formatted = format_description_python(desc)
         
-        print(f"   Original: {repr(desc)}")
+        print(f"   Original: {desc[:200]!r}{'...' if len(desc) > 200 else ''}")
         print(f"   Formatted HTML: {formatted}")
         
         # Verify it contains expected elements
@@ -5,8 +5,8 @@ Test script for the enhanced CEAF scraper with PDF processing and LLM integratio
 
 import sys
 import os
-import json
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -14,13 +14,34 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 from scraper import CEAFScraper
 from llm_processor import LLMProcessor
 
+# Pages and PDFs are kept in the on-disk HTTP cache between test runs; PDF text
+# and LLM results are cached by the scraper itself
+TEST_HTTP_CACHE_EXPIRE = 24 * 3600
+
+def extract_condition_pdf(scraper, condition):
+    """Find, download and extract one condition's PDF; returns (pdf_url, pdf_text, structured_data)."""
+    pdf_url = scraper.find_condition_pdf(condition['url'], condition['name'])
+    if not pdf_url:
+        return None, None, None
+    
+    # Served from the scraper's text cache when the PDF is unchanged since the last run
+    pdf_text = scraper.fetch_and_extract_pdf(pdf_url)
+    if pdf_text is None:
+        return pdf_url, None, None
+    
+    structured_data = None
+    if pdf_text.strip() and scraper.llm_processor:
+        structured_data = scraper.llm_processor.extract_pdf_structured_data(pdf_text, condition['name'])
+    return pdf_url, pdf_text, structured_data
+
 def test_pdf_extraction():
     """Test PDF extraction functionality with a small sample."""
     print("🧪 Testing PDF extraction functionality...")
     
+    scraper = None
     try:
         # Initialize scraper with LLM processing
-        scraper = CEAFScraper(use_llm=True)
+        scraper = CEAFScraper(use_llm=True, http_cache_expire=TEST_HTTP_CACHE_EXPIRE)
         
         # Get the first few conditions for testing
         conditions = scraper.extract_clinical_conditions()
@@ -34,29 +55,23 @@ def test_pdf_extraction():
         # Test with first 2 conditions to avoid long processing time
         test_conditions = conditions[:2]
         
-        for i, condition in enumerate(test_conditions):
+        # Fetch, extract and run the LLM for the conditions concurrently;
+        # results are reported in order afterwards
+        with ThreadPoolExecutor(max_workers=len(test_conditions) or 1) as executor:
+            results = list(executor.map(lambda c: extract_condition_pdf(scraper, c), test_conditions))
+        
+        for i, (condition, (pdf_url, pdf_text, structured_data)) in enumerate(zip(test_conditions, results)):
             print(f"\n🔍 Testing condition {i+1}/2: {condition['name']}")
             
-            # Find PDF for this condition
-            pdf_url = scraper.find_condition_pdf(condition['url'], condition['name'])
-            
             if pdf_url:
                 print(f"📄 Found PDF: {pdf_url}")
                 
-                # Download and extract PDF text
-                pdf_content = scraper.download_pdf(pdf_url)
-                if pdf_content:
-                    pdf_text = scraper.extract_pdf_text(pdf_content)
-                    
+                if pdf_text is not None:
                     if pdf_text.strip():
                         print(f"✅ Successfully extracted text ({len(pdf_text)} chars)")
                         
-                        # Test LLM extraction if available
-                        if scraper.llm_processor:
-                            structured_data = scraper.llm_processor.extract_pdf_structured_data(
-                                pdf_text, condition['name']
-                            )
-                            
+                        # Show LLM extraction if available
+                        if structured_data is not None:
                             print("📊 LLM Extraction Results:")
                             print(f"   CID-10: {len(structured_data.get('cid_10', []))} codes")
                             print(f"   Medications: {len(structured_data.get('medicamentos', []))} items")
@@ -78,13 +93,17 @@ def test_pdf_extraction():
     except Exception as e:
         print(f"❌ Test failed with error: {e}")
         return False
+    finally:
+        if scraper is not None:
+            scraper.close()
 
 def test_full_workflow():
     """Test the complete workflow with PDF data extraction."""
     print("\n🔄 Testing full workflow with PDF data extraction...")
     
+    scraper = None
     try:
-        scraper = CEAFScraper(use_llm=True)
+        scraper = CEAFScraper(use_llm=True, http_cache_expire=TEST_HTTP_CACHE_EXPIRE)
         
         # Run with PDF data extraction for first condition only
         print("⏳ Running scraper with PDF data extraction (limited to 1 condition)...")
@@ -103,9 +122,8 @@ def test_full_workflow():
         pdf_url = scraper.find_condition_pdf(test_condition['url'], test_condition['name'])
         if pdf_url:
             test_condition['pdf_url'] = pdf_url
-            pdf_content = scraper.download_pdf(pdf_url)
-            if pdf_content:
-                pdf_text = scraper.extract_pdf_text(pdf_content)
+            pdf_text = scraper.fetch_and_extract_pdf(pdf_url)
+            if pdf_text is not None:
                 test_condition['pdf_text'] = pdf_text
                 test_condition['pdf_extracted'] = True
                 
@@ -126,12 +144,9 @@ def test_full_workflow():
         }
         
         # Save to test file
+        # save_data encodes with orjson when available and writes under data/
         test_filename = f"test_enhanced_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        test_filepath = os.path.join('data', test_filename)
-        
-        os.makedirs('data', exist_ok=True)
-        with open(test_filepath, 'w', encoding='utf-8') as f:
-            json.dump(result, f, ensure_ascii=False, indent=2)
+        test_filepath = scraper.save_data(result, test_filename, indent=2)
         
         print(f"✅ Test data saved to: {test_filepath}")
         
@@ -165,6 +180,9 @@ def test_full_workflow():
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        if scraper is not None:
+            scraper.close()
 
 def main():
     """Run all tests."""
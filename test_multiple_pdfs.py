@@ -29,9 +29,11 @@ def test_epilepsia_multiple_pdfs():
         'scraped_at': datetime.now().isoformat()
     }
     
+    scraper = None
     try:
         # Initialize scraper
-        scraper = CEAFScraper(use_llm=False)  # Use text parser for faster testing
+        # Use text parser for faster testing; pages are kept in the HTTP cache between runs
+        scraper = CEAFScraper(use_llm=False, http_cache_expire=24 * 3600)
         
         print("🔍 Finding PDFs for epilepsia condition...")
         pdf_links = scraper.find_condition_pdfs(epilepsia_condition['url'], epilepsia_condition['name'])
@@ -67,16 +69,17 @@ def test_epilepsia_multiple_pdfs():
             if pdf_links:
                 # Process the first PDF
                 first_pdf = pdf_links[0]
-                condition_copy = base_condition.copy()
                 
                 print(f"   📑 Processing first PDF: {first_pdf['text']}")
-                condition_copy['pdf_url'] = first_pdf['url']
-                condition_copy['pdf_name'] = first_pdf['text']
-                condition_copy['pdf_extracted'] = True  # Simulate successful extraction
-                
-                # Simulate extracted data
-                condition_copy['medicamentos'] = ['Medicamento A', 'Medicamento B']
-                condition_copy['cid_10'] = ['G40', 'G41']
+                condition_copy = {
+                    **base_condition,
+                    'pdf_url': first_pdf['url'],
+                    'pdf_name': first_pdf['text'],
+                    'pdf_extracted': True,  # Simulate successful extraction
+                    # Simulate extracted data
+                    'medicamentos': ['Medicamento A', 'Medicamento B'],
+                    'cid_10': ['G40', 'G41'],
+                }
                 condition_copy['description'] = scraper.create_custom_description(condition_copy)
                 
                 all_conditions.append(condition_copy)
@@ -87,14 +90,15 @@ def test_epilepsia_multiple_pdfs():
                     print(f"   📑 Processing additional PDF {j}: {additional_pdf['text']}")
                     
                     # Create duplicate condition
-                    duplicate_condition = base_condition.copy()
-                    duplicate_condition['pdf_url'] = additional_pdf['url']
-                    duplicate_condition['pdf_name'] = additional_pdf['text']
-                    duplicate_condition['pdf_extracted'] = True
-                    
-                    # Simulate different extracted data for additional PDF
-                    duplicate_condition['medicamentos'] = [f'Medicamento Additional {j}A', f'Medicamento Additional {j}B']
-                    duplicate_condition['cid_10'] = [f'G4{j}', f'G4{j+1}']
+                    duplicate_condition = {
+                        **base_condition,
+                        'pdf_url': additional_pdf['url'],
+                        'pdf_name': additional_pdf['text'],
+                        'pdf_extracted': True,
+                        # Simulate different extracted data for additional PDF
+                        'medicamentos': [f'Medicamento Additional {j}A', f'Medicamento Additional {j}B'],
+                        'cid_10': [f'G4{j}', f'G4{j+1}'],
+                    }
                     duplicate_condition['description'] = scraper.create_custom_description(duplicate_condition)
                     
                     all_conditions.append(duplicate_condition)
@@ -127,6 +131,9 @@ def test_epilepsia_multiple_pdfs():
         print(f"\n❌ Test failed with error: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        if scraper is not None:
+            scraper.close()
 
 if __name__ == "__main__":
     test_epilepsia_multiple_pdfs()
\ No newline at end of file
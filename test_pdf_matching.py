@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Regression check for PDF-to-condition matching, replayed over the documents
+each condition page listed in the latest scraped data (no network access).
+"""
+
+import sys
+import os
+from html import escape
+
+import lxml.html
+
+# Add src directory to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
+
+from app import DataManager
+from scraper import CEAFScraper
+
+# PDFs linked from every page of the site, never part of a protocol
+FOOTER_PDFS = {'Certidão de Não Atendimento', 'Manual de Visitantes'}
+
+# (condition, PDF link text) pairs that must keep matching
+EXPECTED_MATCHES = [
+    ('Diabetes Mellitus Tipo I', 'Relatório Padronizado - DM Tipo1'),
+    ('Dislipidemia Para Prevenção De Eventos Cardiovasculares E Pancreatite',
+     'Relatório Padronizado – Dislipidemias (Anexo II)'),
+    ('Doença de Pompe', 'Termo De Esclarecimento E Responsabilidade Alfa-Alglicosidase (Anexo I)'),
+    ('Síndrome De Turner', 'Ficha Cadastral - Hormônio do Crescimento Crianças (Anexo I)'),
+    ('Síndrome De Turner', 'Formulário Para Aumento De Dose Crianças (Anexo II)'),
+    ('Transtorno Do Deficit De Atenção E Hiperatividade',
+     'Termo de Consentimento Livre e Esclarecido – TDAH (Anexo I)'),
+    ('Transtorno Do Deficit De Atenção E Hiperatividade', 'Relatório Padronizado – TDAH (Anexo II)'),
+]
+
+def documents_page(documents):
+    """Rebuild a minimal condition page holding the documents' links."""
+    links = ''.join(f'<a href="{escape(doc["url"])}">{escape(doc["name"])}</a>' for doc in documents)
+    return lxml.html.fromstring(f'<html><body>{links}</body></html>')
+
+def test_pdf_matching():
+    """Run every condition's scraped documents through find_condition_pdfs."""
+    print("🔍 Testing PDF Matching Against Scraped Documents")
+    print("=" * 50)
+
+    scraped_data = DataManager.load_latest_scraped_data()
+    conditions = [c for c in scraped_data.get('conditions', []) if c.get('documents')]
+    if not conditions:
+        print("❌ No scraped conditions with documents found")
+        return False
+
+    matched_pairs = set()
+    footer_matches = []
+    total_matches = 0
+
+    with CEAFScraper(use_llm=False) as scraper:
+        for condition in conditions:
+            tree = documents_page(condition['documents'])
+            for pdf in scraper.find_condition_pdfs(condition['url'], condition['name'], tree=tree):
+                # A 0.0 score is the first-PDF fallback, not a match
+                if pdf['match_score'] == 0.0:
+                    continue
+                total_matches += 1
+                matched_pairs.add((condition['name'], pdf['text']))
+                if pdf['text'] in FOOTER_PDFS:
+                    footer_matches.append((condition['name'], pdf['text']))
+
+    print(f"📊 Conditions checked: {len(conditions)}")
+    print(f"📄 Matched PDFs: {total_matches}")
+
+    ok = True
+    if footer_matches:
+        ok = False
+        print(f"❌ Footer PDFs matched {len(footer_matches)} time(s):")
+        for name, text in sorted(set(footer_matches)):
+            print(f"   {name} -> {text}")
+    else:
+        print("✅ No footer PDFs matched")
+
+    names = {c['name'] for c in conditions}
+    for name, text in EXPECTED_MATCHES:
+        if name not in names:
+            print(f"⚠️  {name} not in this dataset, skipped")
+        elif (name, text) in matched_pairs:
+            print(f"✅ {name} -> {text}")
+        else:
+            ok = False
+            print(f"❌ {name} -> {text} no longer matches")
+
+    return ok
+
+if __name__ == "__main__":
+    sys.exit(0 if test_pdf_matching() else 1)
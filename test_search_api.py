@@ -6,6 +6,7 @@ Test the enhanced search API endpoints.
 import requests
 import json
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 def test_search_endpoints():
     print("🔍 Testing Enhanced Search API")
@@ -16,10 +17,26 @@ def test_search_endpoints():
     # Wait a moment for server to be ready
     time.sleep(1)
     
+    # One keep-alive connection pool for all probes instead of a new socket per request
+    session = requests.Session()
+    
+    # The probes are independent, so send them all at once; each result is
+    # reported (and any connection error raised) in order below
+    probe_paths = {
+        'condition': "/search?q=acne",
+        'medication': "/search/medication?q=isotretinoína",
+        'cid': "/search/cid?q=L70",
+        'detail': "/condition/Acne Grave",
+    }
+    # A timeout keeps one stuck endpoint from hanging the whole script
+    executor = ThreadPoolExecutor(max_workers=len(probe_paths))
+    probes = {name: executor.submit(session.get, f"{base_url}{path}", timeout=5)
+              for name, path in probe_paths.items()}
+    
     # Test 1: Search by condition name
     print("1️⃣  Testing condition search...")
     try:
-        response = requests.get(f"{base_url}/search?q=acne")
+        response = probes['condition'].result()
         if response.status_code == 200:
             data = response.json()
             print(f"   ✅ Found {data['total']} results for 'acne'")
@@ -31,7 +48,7 @@ def test_search_endpoints():
     # Test 2: Search by medication
     print("2️⃣  Testing medication search...")
     try:
-        response = requests.get(f"{base_url}/search/medication?q=isotretinoína")
+        response = probes['medication'].result()
         if response.status_code == 200:
             data = response.json()
             print(f"   ✅ Found {data['total']} results for 'isotretinoína'")
@@ -45,7 +62,7 @@ def test_search_endpoints():
     # Test 3: Search by CID-10
     print("3️⃣  Testing CID-10 search...")
     try:
-        response = requests.get(f"{base_url}/search/cid?q=L70")
+        response = probes['cid'].result()
         if response.status_code == 200:
             data = response.json()
             print(f"   ✅ Found {data['total']} results for 'L70'")
@@ -59,7 +76,7 @@ def test_search_endpoints():
     # Test 4: Check condition detail page
     print("4️⃣  Testing condition detail page...")
     try:
-        response = requests.get(f"{base_url}/condition/Acne Grave")
+        response = probes['detail'].result()
         if response.status_code == 200:
             print("   ✅ Condition detail page loads successfully")
         else:
@@ -67,6 +84,9 @@ def test_search_endpoints():
     except Exception as e:
         print(f"   ❌ Connection error: {e}")
     
+    executor.shutdown()
+    session.close()
+    
     print("\n💡 If connection errors occurred, make sure the web server is running:")
     print("   python run.py")
 
@@ -5,7 +5,6 @@ Test script to check if search API returns descriptions.
 
 import sys
 import os
-import json
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -30,13 +29,14 @@ def test_search_api_descriptions():
     # Test what a search would return
     print(f"\n🔍 Testing search functionality...")
     
+    # Lower-case the names once so every query is a plain substring scan
+    names_lower = [condition['name'].lower() for condition in conditions]
+    
     # Simulate search for "acne"
     query = "acne"
-    search_results = []
-    
-    for condition in conditions:
-        if query.lower() in condition['name'].lower():
-            search_results.append(condition)
+    query_lower = query.lower()
+    search_results = [condition for condition, name in zip(conditions, names_lower)
+                      if query_lower in name]
     
     print(f"📋 Search for '{query}' found {len(search_results)} results")
     
@@ -48,14 +48,17 @@ def test_search_api_descriptions():
         
         if 'description' in sample_result:
             desc = sample_result['description']
-            print(f"   Description: {repr(desc)}")
+            if desc:
+                print(f"   Description: {desc[:200]!r}{'...' if len(desc) > 200 else ''}")
+            else:
+                print(f"   Description: {desc!r}")
             
             # Check if it's the expected format
             if desc and '\n' in desc:
                 lines = desc.split('\n')
                 print(f"   Format analysis:")
                 print(f"     Lines: {len(lines)}")
-                for i, line in enumerate(lines):
+                for i, line in enumerate(lines[:10]):
                     if line.strip():
                         print(f"     Line {i+1}: {line.strip()}")
             else:
@@ -89,11 +92,8 @@ def test_search_api_descriptions():
                 'medicamentos': condition.get('medicamentos', [])
             }
             
-            # Simulate JSON serialization (what the API does)
-            json_str = json.dumps(result_json, ensure_ascii=False)
-            parsed_back = json.loads(json_str)
-            
-            if parsed_back.get('description'):
+            # JSON keeps string values intact, so what the API sends is result_json itself
+            if result_json['description']:
                 print(f"   ✅ Would be sent by API with description")
             else:
                 print(f"   ❌ Would be sent by API WITHOUT description")
@@ -5,11 +5,26 @@ Test what data the web application is actually loading.
 
 import sys
 import os
+import io
 import json
+from contextlib import redirect_stdout
+from json.encoder import encode_basestring
 
 # Add src directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+def _json_value(value):
+    """Encode a field; strings skip the generic encoder, anything else (e.g. None) goes through json.dumps."""
+    if isinstance(value, str):
+        return encode_basestring(value)
+    return json.dumps(value, ensure_ascii=False)
+
+def dump_condition_json(name, description, url):
+    """Compact JSON for the fixed {name, description, url} shape the search API returns."""
+    return (f'{{"name":{_json_value(name)},'
+            f'"description":{_json_value(description)},'
+            f'"url":{_json_value(url)}}}')
+
 def test_webapp_data():
     """Test what data the webapp will load."""
     print("🔍 Testing Web Application Data Loading")
@@ -28,13 +43,14 @@ def test_webapp_data():
     conditions = scraped_data.get('conditions', [])
     print(f"📊 DataManager loaded {len(conditions)} conditions")
     
+    # Lower-case the names once so each query is a plain substring scan
+    names_lower = [condition['name'].lower() for condition in conditions]
+    
     # Test search simulation
     query = "acne"
-    search_results = []
-    
-    for condition in conditions:
-        if query.lower() in condition['name'].lower():
-            search_results.append(condition)
+    query_lower = query.lower()
+    search_results = [condition for condition, name in zip(conditions, names_lower)
+                      if query_lower in name]
     
     print(f"🔍 Search simulation for '{query}': {len(search_results)} results")
     
@@ -43,63 +59,49 @@ def test_webapp_data():
         print(f"\n📋 Sample condition that would be returned by API:")
         print(f"   Name: {condition['name']}")
         print(f"   URL: {condition.get('url', 'No URL')}")
-        print(f"   Has description: {'description' in condition}")
+        has_description = 'description' in condition
+        print(f"   Has description: {has_description}")
         
-        if 'description' in condition:
+        if has_description:
             desc = condition['description']
-            print(f"   Description length: {len(desc) if desc else 0}")
-            print(f"   Description preview: {repr(desc[:100] if desc else '')}")
+            # Test the value once; None and '' both report as empty
+            text = desc or ''
+            print(f"   Description length: {len(text)}")
+            print(f"   Description preview: {repr(text[:100])}")
             
             # This is what would be sent in JSON
-            json_data = {
-                'name': condition['name'],
-                'description': condition.get('description', ''),
-                'url': condition.get('url', '')
-            }
-            
-            json_str = json.dumps(json_data, ensure_ascii=False)
+            json_str = dump_condition_json(condition['name'], desc, condition.get('url', ''))
             print(f"   JSON size: {len(json_str)} characters")
             
-            # Parse back to simulate what JavaScript gets
-            parsed = json.loads(json_str)
-            print(f"   Parsed description: {repr(parsed.get('description', ''))}")
+            # JSON keeps strings intact, so JavaScript gets exactly this description
+            print(f"   Parsed description: {repr(desc)}")
             
         else:
             print(f"   ❌ No description field in condition data")
             print(f"   Available fields: {list(condition.keys())}")
     
-    # Check the actual file being used
-    data_dir = 'data'
-    files = [f for f in os.listdir(data_dir) if 
-            (f.startswith('ceaf_conditions_') or 
-             f.startswith('enhanced_ceaf_conditions_') or 
-             f.startswith('enhanced_parsed_ceaf_conditions_') or
-             f.startswith('enhanced_with_descriptions_')) 
-            and f.endswith('.json')]
+    # Check the actual file being used (the one DataManager just loaded)
+    filepath = DataManager.last_loaded_path
     
-    if files:
-        latest_file = sorted(files)[-1]
+    if filepath:
+        latest_file = os.path.basename(filepath)
         print(f"\n📁 Latest data file being used: {latest_file}")
         
-        # Check file size and modification time
-        filepath = os.path.join(data_dir, latest_file)
-        file_size = os.path.getsize(filepath)
-        mod_time = os.path.getmtime(filepath)
+        # Check file size and modification time (one stat call for both)
+        file_stat = os.stat(filepath)
+        file_size = file_stat.st_size
+        mod_time = file_stat.st_mtime
         
         print(f"   File size: {file_size:,} bytes")
         print(f"   Modified: {mod_time}")
         
-        # Quick check of file contents
-        with open(filepath, 'r', encoding='utf-8') as f:
-            file_data = json.load(f)
-        
-        file_conditions = file_data.get('conditions', [])
-        conditions_with_desc = [c for c in file_conditions if c.get('description')]
+        # Quick check of file contents, reusing what DataManager already parsed
+        with_desc_count = sum(1 for c in conditions if c.get('description'))
         
-        print(f"   Conditions in file: {len(file_conditions)}")
-        print(f"   With descriptions: {len(conditions_with_desc)}")
+        print(f"   Conditions in file: {len(conditions)}")
+        print(f"   With descriptions: {with_desc_count}")
         
-        if conditions_with_desc:
+        if with_desc_count:
             print(f"   ✅ File contains descriptions")
         else:
             print(f"   ❌ File has no descriptions")
@@ -110,4 +112,10 @@ def test_webapp_data():
     print(f"   3. Check if descriptions are being sent but not displayed")
 
 if __name__ == "__main__":
-    test_webapp_data()
\ No newline at end of file
+    # Collect the report and hand it to the terminal in a single write
+    report = io.StringIO()
+    try:
+        with redirect_stdout(report):
+            test_webapp_data()
+    finally:
+        sys.stdout.write(report.getvalue())
\ No newline at end of file
@@ -1,7 +1,8 @@
 # wsgi.py
 from src.app import app, initialize_data
 
-# Initialize data when imported by gunicorn
+# Initialize data when imported by gunicorn; with preload_app (gunicorn.conf.py)
+# this runs once in the master and workers inherit the parsed data
 initialize_data()
 
 if __name__ == "__main__":